@@ -1,14 +1,103 @@
+import hashlib
+import json
+import threading
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 import anthropic
+import httpx
+
+# Shared read-only tool_choice value; the SDK serializes it without mutating
+_TOOL_CHOICE_AUTO = {"type": "auto"}
+
+# Transport-level timeout for every API call: the read timeout bounds the
+# gap between stream chunks, so a hung stream aborts instead of blocking
+_API_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Shared HTTP connection pool so all AIGenerator instances reuse warm
+# TCP/TLS connections instead of each building their own httpx client
+_shared_http_client: Optional[httpx.Client] = None
+
+
+def _get_shared_http_client() -> httpx.Client:
+    """Lazily create the shared httpx client used by every AIGenerator"""
+    global _shared_http_client
+    if _shared_http_client is None:
+        _shared_http_client = httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=_API_TIMEOUT,
+        )
+    return _shared_http_client
+
+
+class TokenBucket:
+    """Token-bucket rate limiter for Anthropic requests and tokens per minute"""
+
+    def __init__(self, rpm: int = 40, tpm: int = 16000):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._request_allowance = float(rpm)
+        self._token_allowance = float(tpm)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, estimated_tokens: int = 0):
+        """Block until the budget allows one request with estimated_tokens"""
+        # The allowance refills to at most tpm, so an estimate above it
+        # could never be satisfied and would spin forever; clamp it and
+        # let the API's own validation reject genuinely oversized requests
+        estimated_tokens = min(estimated_tokens, self.tpm)
+
+        while True:
+            with self._lock:
+                self._refill()
+                if (
+                    self._request_allowance >= 1
+                    and self._token_allowance >= estimated_tokens
+                ):
+                    self._request_allowance -= 1
+                    self._token_allowance -= estimated_tokens
+                    return
+
+            # Budget exhausted: pace ourselves instead of triggering a
+            # 429-driven backoff storm on Anthropic's side
+            time.sleep(0.1)
+
+    def refund(self, tokens: int):
+        """Return unused tokens to the budget (e.g. cache-read tokens)"""
+        with self._lock:
+            self._token_allowance = min(self.tpm, self._token_allowance + tokens)
+
+    def _refill(self):
+        """Refill allowances proportionally to elapsed time"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+
+        self._request_allowance = min(
+            self.rpm, self._request_allowance + elapsed * self.rpm / 60.0
+        )
+        self._token_allowance = min(
+            self.tpm, self._token_allowance + elapsed * self.tpm / 60.0
+        )
 
 
-@dataclass
 class ToolCallTracker:
     """Tracks tool calling rounds and execution details"""
 
+    __slots__ = (
+        "max_rounds",
+        "current_round",
+        "tool_calls_made",
+        "execution_times",
+        "errors",
+        "_success_count",
+        "_failure_count",
+        "_total_execution_time",
+    )
+
     def __init__(self, max_rounds: int = 2):
         self.max_rounds = max_rounds
         self.current_round = 0
@@ -16,6 +105,11 @@ class ToolCallTracker:
         self.execution_times = []
         self.errors = []
 
+        # Running counters so get_summary doesn't rescan the call log
+        self._success_count = 0
+        self._failure_count = 0
+        self._total_execution_time = 0.0
+
     def can_make_tool_call(self) -> bool:
         """Check if another tool call round is allowed"""
         return self.current_round < self.max_rounds
@@ -46,6 +140,12 @@ class ToolCallTracker:
         )
 
         self.execution_times.append(execution_time)
+        self._total_execution_time += execution_time
+
+        if success:
+            self._success_count += 1
+        else:
+            self._failure_count += 1
 
         if error:
             self.errors.append(error)
@@ -55,13 +155,9 @@ class ToolCallTracker:
         return {
             "total_rounds": self.current_round,
             "total_tool_calls": len(self.tool_calls_made),
-            "successful_calls": len(
-                [call for call in self.tool_calls_made if call["success"]]
-            ),
-            "failed_calls": len(
-                [call for call in self.tool_calls_made if not call["success"]]
-            ),
-            "total_execution_time": sum(self.execution_times),
+            "successful_calls": self._success_count,
+            "failed_calls": self._failure_count,
+            "total_execution_time": self._total_execution_time,
             "errors": self.errors,
         }
 
@@ -102,13 +198,52 @@ All responses must be:
 Provide only the direct answer to what was asked, informed by all available search results.
 """
 
-    def __init__(self, api_key: str, model: str):
-        self.client = anthropic.Anthropic(api_key=api_key)
+    # Per-round guidance appended after the cached system prefix, indexed
+    # by (round number - 1)
+    _ROUND_GUIDANCE = (
+        "\n\nTool Round 1: This is your first search opportunity. You can make up to 2 total searches. Consider if you need additional information after this search to fully answer the question.",
+        "\n\nTool Round 2: This is your second and final search opportunity. Use this to gather any additional information needed for a comprehensive answer.",
+    )
+
+    # Guidance for the final synthesis call after all tool rounds
+    _SYNTHESIS_GUIDANCE = """
+
+Final Response Phase:
+- Synthesize information from ALL previous searches
+- Provide a comprehensive answer that leverages all gathered context
+- Do not mention the search process itself
+- Focus on directly answering the user's question with all available information
+"""
+
+    # Maximum number of (query, history) responses kept in the LRU cache
+    RESPONSE_CACHE_SIZE = 512
+
+    # Cap on summarized tool context embedded in system prompts, so the
+    # prompt doesn't balloon as rounds accumulate
+    MAX_CONTEXT_SUMMARY_CHARS = 4000
+
+    def __init__(self, api_key: str, model: str, rpm: int = 40, tpm: int = 16000):
+        # The explicit timeout keeps the SDK from substituting its own
+        # (much longer) default over the shared client's read timeout
+        self.client = anthropic.Anthropic(
+            api_key=api_key,
+            http_client=_get_shared_http_client(),
+            timeout=_API_TIMEOUT,
+        )
         self.model = model
 
         # Pre-build base API parameters
         self.base_params = {"model": self.model, "temperature": 0, "max_tokens": 800}
 
+        # LRU cache of tool-less responses keyed by (query, history) hash;
+        # guarded by a lock because requests run on worker threads
+        self._response_cache: OrderedDict[str, str] = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+
+        # Pace API calls to stay under account rate limits instead of
+        # relying on 429s and SDK backoff
+        self._limiter = TokenBucket(rpm=rpm, tpm=tpm)
+
     def generate_response(
         self,
         query: str,
@@ -131,34 +266,160 @@ Provide only the direct answer to what was asked, informed by all available sear
             Generated response as string
         """
 
-        # Build initial system content
-        system_content = (
-            f"{self.SYSTEM_PROMPT}\n\nPrevious conversation:\n{conversation_history}"
-            if conversation_history
-            else self.SYSTEM_PROMPT
-        )
-
-        # Initialize tool tracking
-        tool_tracker = ToolCallTracker(max_tool_rounds)
+        # Build initial system content with prompt-caching breakpoints
+        system_content = self._build_base_system_content(conversation_history)
 
         # Initialize conversation messages
         messages = [{"role": "user", "content": query}]
 
-        # Handle sequential tool execution if tools are available
+        # Handle sequential tool execution if tools are available. Tool-path
+        # responses are never cached: their sources live in the tool manager
+        # and would be silently dropped on a cache hit.
         if tools and tool_manager:
+            tool_tracker = ToolCallTracker(max_tool_rounds)
             return self._handle_sequential_tool_execution(
                 messages, system_content, tools, tool_manager, tool_tracker
             )
-        else:
-            # No tools available, direct response
-            api_params = {
-                **self.base_params,
-                "messages": messages,
-                "system": system_content,
+
+        # Return a cached response for an identical (query, history) call
+        cache_key = self._response_cache_key(query, conversation_history)
+        with self._response_cache_lock:
+            cached_response = self._response_cache.get(cache_key)
+            if cached_response is not None:
+                self._response_cache.move_to_end(cache_key)
+        if cached_response is not None:
+            return cached_response
+
+        # No tools available, direct response
+        api_params = {
+            **self.base_params,
+            "messages": messages,
+            "system": system_content,
+        }
+
+        self._limiter.acquire(self._estimate_tokens(query))
+        response = self.client.messages.create(**api_params)
+        self._refund_cache_reads(response)
+        response_text = response.content[0].text
+
+        self._cache_response(cache_key, response_text)
+        return response_text
+
+    def _estimate_tokens(self, text: str) -> int:
+        """Cheap token estimate for rate limiting: ~4 chars per token plus overhead"""
+        return len(text) // 4 + 500
+
+    def _refund_cache_reads(self, response):
+        """Return cache-read tokens to the rate budget; they don't count against TPM"""
+        usage = getattr(response, "usage", None)
+        cached_tokens = getattr(usage, "cache_read_input_tokens", 0)
+        if isinstance(cached_tokens, int) and cached_tokens > 0:
+            self._limiter.refund(cached_tokens)
+
+    def generate_responses_batch(
+        self,
+        queries: List[Tuple[str, Optional[str]]],
+        poll_interval: float = 5.0,
+    ) -> List[str]:
+        """
+        Generate responses for many queries via the Message Batches API.
+
+        Batched requests are billed at half the interactive price, so bulk
+        non-interactive work (ingest-time enrichment, evaluation runs)
+        should be routed through here instead of generate_response. Tool
+        use is not supported on this path.
+
+        Args:
+            queries: List of (query, conversation_history) pairs
+            poll_interval: Seconds to wait between batch status polls
+
+        Returns:
+            List of response texts in the same order as the input queries
+        """
+        requests = [
+            {
+                "custom_id": f"query-{index}",
+                "params": {
+                    **self.base_params,
+                    "messages": [{"role": "user", "content": query}],
+                    "system": self._build_base_system_content(conversation_history),
+                },
             }
+            for index, (query, conversation_history) in enumerate(queries)
+        ]
 
-            response = self.client.messages.create(**api_params)
-            return response.content[0].text
+        batch = self.client.messages.batches.create(requests=requests)
+
+        # Poll until Anthropic has processed the whole batch
+        while batch.processing_status != "ended":
+            time.sleep(poll_interval)
+            batch = self.client.messages.batches.retrieve(batch.id)
+
+        responses = {}
+        for result in self.client.messages.batches.results(batch.id):
+            if result.result.type == "succeeded":
+                responses[result.custom_id] = result.result.message.content[0].text
+            else:
+                responses[result.custom_id] = (
+                    f"Batch request failed: {result.result.type}"
+                )
+
+        return [responses.get(f"query-{i}", "") for i in range(len(queries))]
+
+    def _response_cache_key(
+        self, query: str, conversation_history: Optional[str]
+    ) -> str:
+        """Build a cache key from the query and conversation history
+
+        The query is length-prefixed so the two components can't alias
+        (("a||b", "c") and ("a", "b||c") must hash differently).
+        """
+        history = conversation_history or ""
+        raw_key = f"{len(query)}:{query}{history}"
+        return hashlib.sha256(raw_key.encode()).hexdigest()
+
+    def _cache_response(self, cache_key: str, response_text: str):
+        """Insert a response into the LRU cache, evicting the oldest entry if full"""
+        with self._response_cache_lock:
+            self._response_cache[cache_key] = response_text
+            if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+    def _build_base_system_content(
+        self, conversation_history: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Build base system content blocks with prompt-caching breakpoints.
+
+        The static SYSTEM_PROMPT and conversation history are marked with
+        cache_control breakpoints so repeated calls within a query (and
+        follow-up queries in the same session) hit Anthropic's prompt cache
+        instead of re-billing the full static prefix.
+
+        Args:
+            conversation_history: Previous messages for context
+
+        Returns:
+            List of system content blocks for the Anthropic API
+        """
+        system_blocks = [
+            {
+                "type": "text",
+                "text": self.SYSTEM_PROMPT,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+
+        if conversation_history:
+            system_blocks.append(
+                {
+                    "type": "text",
+                    "text": f"Previous conversation:\n{conversation_history}",
+                    "cache_control": {"type": "ephemeral"},
+                }
+            )
+
+        return system_blocks
 
     def _handle_tool_execution(
         self, initial_response, base_params: Dict[str, Any], tool_manager
@@ -174,8 +435,9 @@ Provide only the direct answer to what was asked, informed by all available sear
         Returns:
             Final response text after tool execution
         """
-        # Start with existing messages
-        messages = base_params["messages"].copy()
+        # Start with existing messages (appended to in place; the SDK
+        # doesn't mutate the list, so no defensive copy is needed)
+        messages = base_params["messages"]
 
         # Add AI's tool use response
         messages.append({"role": "assistant", "content": initial_response.content})
@@ -214,7 +476,7 @@ Provide only the direct answer to what was asked, informed by all available sear
     def _handle_sequential_tool_execution(
         self,
         messages: List[Dict[str, Any]],
-        system_content: str,
+        system_content: List[Dict[str, Any]],
         tools: List,
         tool_manager,
         tool_tracker: ToolCallTracker,
@@ -224,7 +486,7 @@ Provide only the direct answer to what was asked, informed by all available sear
 
         Args:
             messages: Initial conversation messages
-            system_content: Base system content
+            system_content: Base system content blocks
             tools: Available tools
             tool_manager: Manager to execute tools
             tool_tracker: Tracker for tool execution rounds
@@ -234,6 +496,7 @@ Provide only the direct answer to what was asked, informed by all available sear
         """
 
         accumulated_context = []
+        last_assistant_text = ""
 
         while tool_tracker.can_make_tool_call():
             # Start new round
@@ -244,23 +507,34 @@ Provide only the direct answer to what was asked, informed by all available sear
                 system_content, accumulated_context, current_round
             )
 
-            # Prepare API parameters
+            # Prepare API parameters; the SDK doesn't mutate the message list,
+            # so it's passed directly rather than copied each round
             api_params = {
-                **self.base_params,
-                "messages": messages.copy(),
+                "model": self.model,
+                "temperature": 0,
+                "max_tokens": 800,
+                "messages": messages,
                 "system": enriched_system,
                 "tools": tools,
-                "tool_choice": {"type": "auto"},
+                "tool_choice": _TOOL_CHOICE_AUTO,
             }
 
             # Get response from Claude
+            self._limiter.acquire(self._estimate_tokens(str(messages[0]["content"])))
             response = self.client.messages.create(**api_params)
+            self._refund_cache_reads(response)
 
             # Add Claude's response to messages
             messages.append({"role": "assistant", "content": response.content})
 
             # Check if Claude wants to use tools
             if response.stop_reason == "tool_use":
+                # Remember any narration Claude produced alongside its tool
+                # calls — only as a fallback if synthesis can't run
+                last_assistant_text = (
+                    self._extract_text_content(response.content) or last_assistant_text
+                )
+
                 # Execute tools and track results
                 tool_results, context_entry = self._execute_and_track_tools(
                     response, tool_manager, tool_tracker, current_round
@@ -289,32 +563,60 @@ Provide only the direct answer to what was asked, informed by all available sear
             )
 
             final_params = {
-                **self.base_params,
+                "model": self.model,
+                "temperature": 0,
+                "max_tokens": 800,
                 "messages": messages,
                 "system": final_system,
                 # No tools for final synthesis
             }
 
-            final_response = self.client.messages.create(**final_params)
-            return final_response.content[0].text
+            return self._stream_final_response(final_params)
+
+        # No synthesis possible (e.g. tool execution failed): fall back to
+        # the last text Claude produced during the tool rounds
+        return (
+            last_assistant_text
+            or "I apologize, but I couldn't generate a proper response."
+        )
+
+    def _extract_text_content(self, content) -> str:
+        """Extract concatenated text from a response's content blocks"""
+        text_parts = []
+        for block in content:
+            if isinstance(block, dict):
+                if block.get("type") == "text":
+                    text_parts.append(block.get("text", ""))
+            elif getattr(block, "type", None) == "text":
+                text_parts.append(block.text)
+
+        return "\n".join(text_parts).strip()
+
+    def _stream_final_response(self, api_params: Dict[str, Any]) -> str:
+        """
+        Stream the final synthesis response and return the accumulated text.
 
-        # Return last assistant response
-        for message in reversed(messages):
-            if message["role"] == "assistant":
-                content = message["content"]
-                if isinstance(content, list) and content:
-                    # Extract text from content blocks
-                    text_parts = []
-                    for block in content:
-                        if hasattr(block, "text"):
-                            text_parts.append(block.text)
-                        elif isinstance(block, dict) and block.get("type") == "text":
-                            text_parts.append(block.get("text", ""))
+        The synthesis call is typically the longest one (full context, large
+        output, no tools), so streaming starts consuming output as soon as
+        the first token arrives. A hung stream is bounded by the transport
+        read timeout (_API_TIMEOUT) rather than checked in this loop.
 
-                    if text_parts:
-                        return "\n".join(text_parts)
+        Args:
+            api_params: Complete API parameters for the synthesis call
 
-        return "I apologize, but I couldn't generate a proper response."
+        Returns:
+            Accumulated response text
+        """
+        chunks = []
+
+        self._limiter.acquire(
+            self._estimate_tokens(str(api_params["messages"][0]["content"]))
+        )
+        with self.client.messages.stream(**api_params) as stream:
+            for text in stream.text_stream:
+                chunks.append(text)
+
+        return "".join(chunks)
 
     def _execute_and_track_tools(
         self, response, tool_manager, tool_tracker: ToolCallTracker, current_round: int
@@ -335,73 +637,120 @@ Provide only the direct answer to what was asked, informed by all available sear
         tool_results = []
         tool_executions = []
 
-        for content_block in response.content:
-            if content_block.type == "tool_use":
-                start_time = time.time()
-
-                try:
-                    # Execute the tool
-                    tool_result = tool_manager.execute_tool(
-                        content_block.name, **content_block.input
-                    )
+        tool_blocks = [
+            content_block
+            for content_block in response.content
+            if content_block.type == "tool_use"
+        ]
+
+        def block_key(content_block):
+            """Hashable identity of a tool call: name plus canonical input"""
+            return (
+                content_block.name,
+                json.dumps(content_block.input, sort_keys=True, default=str),
+            )
 
-                    execution_time = time.time() - start_time
+        # Deduplicate identical (name, input) calls within the round so a
+        # hedged duplicate search only hits the underlying tool once
+        unique_blocks = []
+        seen_keys = set()
+        for content_block in tool_blocks:
+            key = block_key(content_block)
+            if key not in seen_keys:
+                seen_keys.add(key)
+                unique_blocks.append(content_block)
+
+        def execute_block(content_block):
+            """Execute a single tool call and capture timing and errors"""
+            start_time = time.time()
+
+            try:
+                tool_result = tool_manager.execute_tool(
+                    content_block.name, **content_block.input
+                )
+                execution_time = time.time() - start_time
+                return content_block, tool_result, execution_time, None
+            except Exception as e:
+                execution_time = time.time() - start_time
+                return content_block, None, execution_time, e
+
+        # Tool calls are independent I/O work, so run them concurrently;
+        # executor.map preserves the original block order for the results
+        if len(unique_blocks) > 1:
+            with ThreadPoolExecutor(max_workers=len(unique_blocks)) as executor:
+                outcomes = list(executor.map(execute_block, unique_blocks))
+        else:
+            outcomes = [execute_block(block) for block in unique_blocks]
 
-                    # Log successful execution
-                    tool_tracker.log_tool_call(
-                        content_block.name, content_block.input, execution_time, True
-                    )
+        outcomes_by_key = {
+            block_key(executed_block): (tool_result, execution_time, error)
+            for executed_block, tool_result, execution_time, error in outcomes
+        }
 
-                    tool_results.append(
-                        {
-                            "type": "tool_result",
-                            "tool_use_id": content_block.id,
-                            "content": tool_result,
-                        }
-                    )
+        logged_keys = set()
+        for content_block in tool_blocks:
+            key = block_key(content_block)
+            tool_result, execution_time, error = outcomes_by_key[key]
+
+            # Memoized duplicates cost nothing; log them with zero time so
+            # the summary distinguishes real from reused executions
+            if key in logged_keys:
+                execution_time = 0.0
+            logged_keys.add(key)
+            if error is None:
+                # Log successful execution
+                tool_tracker.log_tool_call(
+                    content_block.name, content_block.input, execution_time, True
+                )
 
-                    tool_executions.append(
-                        {
-                            "tool_name": content_block.name,
-                            "input": content_block.input,
-                            "result": tool_result,
-                            "execution_time": execution_time,
-                            "success": True,
-                        }
-                    )
+                tool_results.append(
+                    {
+                        "type": "tool_result",
+                        "tool_use_id": content_block.id,
+                        "content": tool_result,
+                    }
+                )
 
-                except Exception as e:
-                    execution_time = time.time() - start_time
-                    error_msg = f"Tool execution failed: {str(e)}"
-
-                    # Log failed execution
-                    tool_tracker.log_tool_call(
-                        content_block.name,
-                        content_block.input,
-                        execution_time,
-                        False,
-                        error_msg,
-                    )
+                tool_executions.append(
+                    {
+                        "tool_name": content_block.name,
+                        "input": content_block.input,
+                        "result": tool_result,
+                        "execution_time": execution_time,
+                        "success": True,
+                    }
+                )
+            else:
+                error_msg = f"Tool execution failed: {str(error)}"
+
+                # Log failed execution
+                tool_tracker.log_tool_call(
+                    content_block.name,
+                    content_block.input,
+                    execution_time,
+                    False,
+                    error_msg,
+                )
 
-                    tool_results.append(
-                        {
-                            "type": "tool_result",
-                            "tool_use_id": content_block.id,
-                            "content": error_msg,
-                            "is_error": True,
-                        }
-                    )
+                tool_results.append(
+                    {
+                        "type": "tool_result",
+                        "tool_use_id": content_block.id,
+                        "content": error_msg,
+                        "is_error": True,
+                    }
+                )
 
-                    tool_executions.append(
-                        {
-                            "tool_name": content_block.name,
-                            "input": content_block.input,
-                            "result": error_msg,
-                            "execution_time": execution_time,
-                            "success": False,
-                            "error": str(e),
-                        }
-                    )
+                tool_executions.append(
+                    {
+                        "tool_name": content_block.name,
+                        "input": content_block.input,
+                        "result": error_msg,
+                        "execution_time": execution_time,
+                        "success": False,
+                        "error": str(error),
+                    }
+                )
 
         # Create context entry for this round
         context_entry = {
@@ -416,68 +765,76 @@ Provide only the direct answer to what was asked, informed by all available sear
         return tool_results if tool_results else None, context_entry
 
     def _build_enriched_system_content(
-        self, base_content: str, accumulated_context: List[Dict], current_round: int
-    ) -> str:
+        self,
+        base_content: List[Dict[str, Any]],
+        accumulated_context: List[Dict],
+        current_round: int,
+    ) -> List[Dict[str, Any]]:
         """
         Build enriched system content including previous tool results and round guidance.
 
+        The per-round guidance and context summary go in a separate block
+        *after* the cached base blocks, so the cache key for the static
+        prefix stays stable across rounds.
+
         Args:
-            base_content: Base system prompt
+            base_content: Base system content blocks
             accumulated_context: List of previous tool execution contexts
             current_round: Current round number
 
         Returns:
-            Enriched system content
+            Enriched system content blocks
         """
 
+        # Round 1 has no prior context to add, and the SYSTEM_PROMPT already
+        # explains the search budget — send the cached base blocks untouched
+        # so the prompt-cache prefix stays as long as possible
+        if not accumulated_context and current_round == 1:
+            return base_content
+
         # Add round-specific guidance
-        round_guidance = ""
-        if current_round == 1:
-            round_guidance = "\n\nTool Round 1: This is your first search opportunity. You can make up to 2 total searches. Consider if you need additional information after this search to fully answer the question."
-        elif current_round == 2:
-            round_guidance = "\n\nTool Round 2: This is your second and final search opportunity. Use this to gather any additional information needed for a comprehensive answer."
+        if 1 <= current_round <= len(self._ROUND_GUIDANCE):
+            round_guidance = self._ROUND_GUIDANCE[current_round - 1]
+        else:
+            round_guidance = ""
 
-        enriched_content = base_content + round_guidance
+        variable_content = round_guidance
 
         # Add context from previous rounds
         if accumulated_context:
             context_summary = self._summarize_tool_context(accumulated_context)
-            enriched_content += f"\n\nPrevious search results:\n{context_summary}"
+            variable_content += f"\n\nPrevious search results:\n{context_summary}"
+
+        if not variable_content:
+            return base_content
 
-        return enriched_content
+        # Variable content is intentionally uncached (changes every round)
+        return base_content + [{"type": "text", "text": variable_content}]
 
     def _build_synthesis_system_content(
-        self, base_content: str, accumulated_context: List[Dict]
-    ) -> str:
+        self, base_content: List[Dict[str, Any]], accumulated_context: List[Dict]
+    ) -> List[Dict[str, Any]]:
         """
-        Build system content for final synthesis phase.
+        Build system content blocks for final synthesis phase.
 
         Args:
-            base_content: Base system prompt
+            base_content: Base system content blocks
             accumulated_context: List of all tool execution contexts
 
         Returns:
-            System content for synthesis
+            System content blocks for synthesis
         """
 
-        synthesis_guidance = """
-
-Final Response Phase:
-- Synthesize information from ALL previous searches
-- Provide a comprehensive answer that leverages all gathered context
-- Do not mention the search process itself
-- Focus on directly answering the user's question with all available information
-"""
-
-        enriched_content = base_content + synthesis_guidance
+        variable_content = self._SYNTHESIS_GUIDANCE
 
         if accumulated_context:
             context_summary = self._summarize_tool_context(accumulated_context)
-            enriched_content += (
+            variable_content += (
                 f"\n\nAll search results to synthesize:\n{context_summary}"
             )
 
-        return enriched_content
+        # Synthesis guidance is uncached; the base blocks keep their breakpoints
+        return base_content + [{"type": "text", "text": variable_content}]
 
     def _summarize_tool_context(self, accumulated_context: List[Dict]) -> str:
         """
@@ -493,25 +850,36 @@ Final Response Phase:
         summaries = []
 
         for context_entry in accumulated_context:
-            round_num = context_entry["round"]
-            executions = context_entry["tool_executions"]
-
-            round_summary = f"Round {round_num}:"
+            # Build each round summary as a list of parts; joining once avoids
+            # quadratic string reallocation for rounds with many tool calls
+            parts = [f"Round {context_entry['round']}:"]
 
-            for exec in executions:
-                tool_name = exec["tool_name"]
-                success = exec["success"]
+            for execution in context_entry["tool_executions"]:
+                tool_name = execution["tool_name"]
 
-                if success:
+                if execution["success"]:
                     # Truncate result for summary
-                    result = exec["result"]
+                    result = execution["result"]
                     if len(result) > 300:
                         result = result[:300] + "..."
 
-                    round_summary += f"\n  - {tool_name}: {result}"
+                    parts.append(f"\n  - {tool_name}: {result}")
                 else:
-                    round_summary += f"\n  - {tool_name}: Failed ({exec.get('error', 'Unknown error')})"
+                    parts.append(
+                        f"\n  - {tool_name}: Failed ({execution.get('error', 'Unknown error')})"
+                    )
+
+            summaries.append("".join(parts))
 
-            summaries.append(round_summary)
+        # Keep the most recent rounds within the size budget; the latest
+        # round matters most for deciding the next tool call
+        total_chars = 0
+        kept = []
+        for round_summary in reversed(summaries):
+            total_chars += len(round_summary)
+            if kept and total_chars > self.MAX_CONTEXT_SUMMARY_CHARS:
+                kept.append("... (earlier rounds truncated)")
+                break
+            kept.append(round_summary)
 
-        return "\n\n".join(summaries)
+        return "\n\n".join(reversed(kept))
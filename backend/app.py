@@ -2,6 +2,7 @@ import warnings
 
 warnings.filterwarnings("ignore", message="resource_tracker: There appear to be.*")
 
+import asyncio
 import os
 from typing import List, Optional
 
@@ -68,8 +69,11 @@ async def query_documents(request: QueryRequest):
         if not session_id:
             session_id = rag_system.session_manager.create_session()
 
-        # Process query using RAG system
-        answer, sources = rag_system.query(request.query, session_id)
+        # Process query using RAG system in a worker thread so the blocking
+        # Anthropic/ChromaDB calls don't pin the event loop
+        answer, sources = await asyncio.to_thread(
+            rag_system.query, request.query, session_id
+        )
 
         return QueryResponse(answer=answer, sources=sources, session_id=session_id)
     except Exception as e:
@@ -80,7 +84,7 @@ async def query_documents(request: QueryRequest):
 async def get_course_stats():
     """Get course analytics and statistics"""
     try:
-        analytics = rag_system.get_course_analytics()
+        analytics = await asyncio.to_thread(rag_system.get_course_analytics)
         return CourseStats(
             total_courses=analytics["total_courses"],
             course_titles=analytics["course_titles"],
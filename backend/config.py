@@ -14,6 +14,8 @@ class Config:
     # Anthropic API settings
     ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY", "")
     ANTHROPIC_MODEL: str = "claude-sonnet-4-20250514"
+    RATE_LIMIT_RPM: int = 40  # Anthropic requests allowed per minute
+    RATE_LIMIT_TPM: int = 16000  # Anthropic input tokens allowed per minute
 
     # HuggingFace settings
     HF_TOKEN: str = os.getenv("HF_TOKEN", "")
@@ -23,7 +23,10 @@ class RAGSystem:
             config.CHROMA_PATH, config.EMBEDDING_MODEL, config.MAX_RESULTS
         )
         self.ai_generator = AIGenerator(
-            config.ANTHROPIC_API_KEY, config.ANTHROPIC_MODEL
+            config.ANTHROPIC_API_KEY,
+            config.ANTHROPIC_MODEL,
+            rpm=config.RATE_LIMIT_RPM,
+            tpm=config.RATE_LIMIT_TPM,
         )
         self.session_manager = SessionManager(config.MAX_HISTORY)
 
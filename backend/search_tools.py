@@ -123,6 +123,8 @@ class ToolManager:
 
     def __init__(self):
         self.tools = {}
+        # Bound execute methods keyed by name, resolved once at registration
+        self._dispatch = {}
 
     def register_tool(self, tool: Tool):
         """Register any tool that implements the Tool interface"""
@@ -131,6 +133,7 @@ class ToolManager:
         if not tool_name:
             raise ValueError("Tool must have a 'name' in its definition")
         self.tools[tool_name] = tool
+        self._dispatch[tool_name] = tool.execute
 
     def get_tool_definitions(self) -> list:
         """Get all tool definitions for Anthropic tool calling"""
@@ -138,10 +141,11 @@ class ToolManager:
 
     def execute_tool(self, tool_name: str, **kwargs) -> str:
         """Execute a tool by name with given parameters"""
-        if tool_name not in self.tools:
+        execute = self._dispatch.get(tool_name)
+        if execute is None:
             return f"Tool '{tool_name}' not found"
 
-        return self.tools[tool_name].execute(**kwargs)
+        return execute(**kwargs)
 
     def get_last_sources(self) -> list:
         """Get sources from the last search operation"""
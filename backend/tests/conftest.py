@@ -1,16 +1,45 @@
 """
 Shared pytest fixtures for the RAG system tests
 """
+
 import os
-import tempfile
 import shutil
+import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
+
 import pytest
 from fastapi.testclient import TestClient
 
-# Mock the RAG system components to avoid real API calls and file operations
-@pytest.fixture
+# Keep temporary test stores (ChromaDB sqlite etc.) on tmpfs when available,
+# turning their disk I/O into memory writes
+if os.path.isdir("/dev/shm"):
+    tempfile.tempdir = "/dev/shm"
+
+
+def pytest_addoption(parser):
+    """Add a --fast option that skips tests marked slow"""
+    parser.addoption(
+        "--fast",
+        action="store_true",
+        default=False,
+        help="Skip tests marked as slow",
+    )
+
+
+def pytest_configure(config):
+    """Translate --fast into a marker expression"""
+    if config.getoption("--fast"):
+        existing = config.option.markexpr
+        config.option.markexpr = (
+            f"not slow and ({existing})" if existing else "not slow"
+        )
+
+
+# Mock the RAG system components to avoid real API calls and file operations.
+# These are attribute bags shared for the whole session; per-test behavior is
+# restored by the autouse reset fixture in test_api_endpoints.py.
+@pytest.fixture(scope="session")
 def mock_config():
     """Mock configuration for testing"""
     from unittest.mock import Mock
@@ -27,33 +56,35 @@ def mock_config():
     return config
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_vector_store():
     """Mock vector store for testing"""
     mock_store = Mock()
     mock_store.search.return_value = Mock(
         is_empty=lambda: False,
         documents=[["test document content"]],
-        metadatas=[[{"course": "Test Course", "lesson": "Test Lesson", "source": "test.txt"}]],
-        ids=[["test_id_1"]]
+        metadatas=[
+            [{"course": "Test Course", "lesson": "Test Lesson", "source": "test.txt"}]
+        ],
+        ids=[["test_id_1"]],
     )
     mock_store.get_course_count.return_value = 1
     mock_store.get_courses.return_value = ["Test Course"]
     return mock_store
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_ai_generator():
     """Mock AI generator for testing"""
     mock_generator = Mock()
     mock_generator.generate_response.return_value = (
         "This is a test response",
-        ["test.txt - Test Course: Test Lesson"]
+        ["test.txt - Test Course: Test Lesson"],
     )
     return mock_generator
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_search_tools():
     """Mock search tools for testing"""
     mock_tools = Mock()
@@ -62,7 +93,7 @@ def mock_search_tools():
     return mock_tools
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_session_manager():
     """Mock session manager for testing"""
     mock_manager = Mock()
@@ -72,10 +103,30 @@ def mock_session_manager():
     return mock_manager
 
 
-@pytest.fixture
-def mock_rag_system(mock_config, mock_vector_store, mock_ai_generator, mock_search_tools, mock_session_manager):
+@pytest.fixture(scope="session")
+def mock_rag_system(
+    mock_config,
+    mock_vector_store,
+    mock_ai_generator,
+    mock_search_tools,
+    mock_session_manager,
+):
     """Mock RAG system with all dependencies"""
-    mock_rag = Mock()
+    # Spec by attribute names: catches typos like the real RAGSystem spec
+    # would, without importing the chromadb/torch chain at collection time
+    mock_rag = Mock(
+        spec=[
+            "config",
+            "vector_store",
+            "ai_generator",
+            "tool_manager",
+            "session_manager",
+            "query",
+            "get_course_analytics",
+            "add_course_document",
+            "add_course_folder",
+        ]
+    )
     mock_rag.config = mock_config
     mock_rag.vector_store = mock_vector_store
     mock_rag.ai_generator = mock_ai_generator
@@ -85,13 +136,13 @@ def mock_rag_system(mock_config, mock_vector_store, mock_ai_generator, mock_sear
     # Mock the query method
     mock_rag.query.return_value = (
         "This is a test response to your query",
-        ["test.txt - Test Course: Test Lesson"]
+        ["test.txt - Test Course: Test Lesson"],
     )
 
     # Mock analytics method
     mock_rag.get_course_analytics.return_value = {
         "total_courses": 1,
-        "course_titles": ["Test Course"]
+        "course_titles": ["Test Course"],
     }
 
     return mock_rag
@@ -106,7 +157,8 @@ def temp_docs_dir():
 
     # Create a test document
     test_doc = docs_dir / "test_course.txt"
-    test_doc.write_text("""Course Title: Test Course
+    test_doc.write_text(
+        """Course Title: Test Course
 Course Link: https://example.com/test-course
 Course Instructor: Test Instructor
 
@@ -115,7 +167,8 @@ This is the introduction lesson content.
 
 Lesson 1: Basics
 This covers the basic concepts.
-""")
+"""
+    )
 
     yield str(docs_dir)
 
@@ -128,7 +181,7 @@ def sample_query_request():
     """Sample query request data for API testing"""
     return {
         "query": "What is the introduction lesson about?",
-        "session_id": "test-session-123"
+        "session_id": "test-session-123",
     }
 
 
@@ -138,23 +191,20 @@ def sample_query_response():
     return {
         "answer": "The introduction lesson covers basic course concepts.",
         "sources": ["test_course.txt - Test Course: Introduction"],
-        "session_id": "test-session-123"
+        "session_id": "test-session-123",
     }
 
 
 @pytest.fixture
 def sample_course_stats():
     """Sample course statistics for API testing"""
-    return {
-        "total_courses": 1,
-        "course_titles": ["Test Course"]
-    }
+    return {"total_courses": 1, "course_titles": ["Test Course"]}
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture
 def mock_anthropic_client():
-    """Mock Anthropic client to avoid real API calls"""
-    with patch('anthropic.Anthropic') as mock_client:
+    """Mock Anthropic client to avoid real API calls (opt in per test)"""
+    with patch("anthropic.Anthropic") as mock_client:
         # Mock the client instance
         mock_instance = Mock()
         mock_client.return_value = mock_instance
@@ -171,8 +221,8 @@ def mock_anthropic_client():
 @pytest.fixture
 def mock_sentence_transformers():
     """Mock SentenceTransformer to avoid downloading models"""
-    with patch('sentence_transformers.SentenceTransformer') as mock_st:
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
         mock_model = Mock()
         mock_model.encode.return_value = [[0.1, 0.2, 0.3]]  # Mock embedding
         mock_st.return_value = mock_model
-        yield mock_model
\ No newline at end of file
+        yield mock_model
@@ -0,0 +1,114 @@
+"""
+In-memory stand-in for the ChromaDB-backed vector store
+"""
+
+from typing import List, Optional
+
+from models import Course, CourseChunk
+from vector_store import SearchResults
+
+
+class FakeVectorStore:
+    """Dict-backed VectorStore lookalike for fast unit tests
+
+    Implements the surface the tests exercise — substring search with
+    course/lesson filtering, course-name resolution, and catalog metadata —
+    without loading an embedding model or touching disk.
+    """
+
+    def __init__(self, max_results: int = 5):
+        self.max_results = max_results
+        self._courses: List[Course] = []
+        self._chunks: List[CourseChunk] = []
+
+    def add_course_metadata(self, course: Course):
+        """Add course information to the catalog"""
+        self._courses.append(course)
+
+    def add_course_content(self, chunks: List[CourseChunk]):
+        """Add course content chunks"""
+        self._chunks.extend(chunks)
+
+    def clear_all_data(self):
+        """Clear all stored courses and chunks"""
+        self._courses = []
+        self._chunks = []
+
+    def search(
+        self,
+        query: str,
+        course_name: Optional[str] = None,
+        lesson_number: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> SearchResults:
+        """Substring search over stored chunks with the real filter rules"""
+        course_title = None
+        if course_name:
+            course_title = self._resolve_course_name(course_name)
+            if not course_title:
+                return SearchResults.empty(f"No course found matching '{course_name}'")
+
+        matches = []
+        query_terms = query.lower().split()
+        for chunk in self._chunks:
+            if course_title and chunk.course_title != course_title:
+                continue
+            if lesson_number is not None and chunk.lesson_number != lesson_number:
+                continue
+            if any(term in chunk.content.lower() for term in query_terms):
+                matches.append(chunk)
+
+        search_limit = limit if limit is not None else self.max_results
+        matches = matches[:search_limit]
+
+        return SearchResults(
+            documents=[chunk.content for chunk in matches],
+            metadata=[
+                {
+                    "course_title": chunk.course_title,
+                    "lesson_number": chunk.lesson_number,
+                    "chunk_index": chunk.chunk_index,
+                }
+                for chunk in matches
+            ],
+            distances=[0.0] * len(matches),
+        )
+
+    def _resolve_course_name(self, course_name: str) -> Optional[str]:
+        """Resolve a partial course name to a stored title"""
+        return next(
+            (
+                course.title
+                for course in self._courses
+                if course_name.lower() in course.title.lower()
+            ),
+            None,
+        )
+
+    def get_course_count(self) -> int:
+        """Get the number of stored courses"""
+        return len(self._courses)
+
+    def get_existing_course_titles(self) -> List[str]:
+        """Get all stored course titles"""
+        return [course.title for course in self._courses]
+
+    def get_all_courses_metadata(self) -> List[dict]:
+        """Get catalog metadata in the same shape as the real store"""
+        return [
+            {
+                "title": course.title,
+                "instructor": course.instructor,
+                "course_link": course.course_link,
+                "lessons": [
+                    {
+                        "lesson_number": lesson.lesson_number,
+                        "lesson_title": lesson.title,
+                        "lesson_link": lesson.lesson_link,
+                    }
+                    for lesson in course.lessons
+                ],
+                "lesson_count": len(course.lessons),
+            }
+            for course in self._courses
+        ]
@@ -1,95 +1,207 @@
-import os
-import sys
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from unittest.mock import MagicMock, Mock, patch
+import copy
+from collections import namedtuple
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, create_autospec, patch
 
+import ai_generator as ai_generator_module
 import pytest
-from ai_generator import AIGenerator, ToolCallTracker
+from ai_generator import AIGenerator, TokenBucket, ToolCallTracker
+from search_tools import ToolManager
+
+# Canonical tool definition and search result shared by the fixtures below;
+# fixtures hand out shallow copies instead of rebuilding the dicts per test
+_TOOL_DEFS = (
+    {
+        "name": "search_course_content",
+        "description": "Search course materials",
+        "input_schema": {
+            "type": "object",
+            "properties": {"query": {"type": "string"}},
+            "required": ["query"],
+        },
+    },
+)
+
+# Cheap carrier for response text blocks (single C-level constructor)
+TextBlock = namedtuple("TextBlock", ["text"])
+
+_SEARCH_RESULT = "Search results: Python is a programming language"
+
+# Ready-to-pass tools argument so tests don't route through the mock's
+# call-recording machinery just to fetch the same list
+_TOOL_DEFS_LIST = list(_TOOL_DEFS)
+
+
+def _tool_use(query, id_):
+    """Build a tool_use content block stub"""
+    return SimpleNamespace(
+        type="tool_use",
+        name="search_course_content",
+        input={"query": query},
+        id=id_,
+    )
+
+
+def _tool_response(tool_use):
+    """Build a response stub that requests the given tool call"""
+    return SimpleNamespace(content=[tool_use], stop_reason="tool_use")
+
+
+# Autospec'd once at import; fixtures copy and reset it per test, which is
+# much cheaper than rebuilding the spec tree and catches attribute typos
+_TOOL_MANAGER_TEMPLATE = create_autospec(ToolManager, instance=True)
+
+
+def _make_tool_manager():
+    """Hand out a reset copy of the autospec'd ToolManager template"""
+    manager = copy.copy(_TOOL_MANAGER_TEMPLATE)
+    manager.reset_mock(return_value=True, side_effect=True)
+    manager.get_tool_definitions.return_value = list(_TOOL_DEFS)
+    return manager
+
+
+@pytest.fixture(scope="module")
+def mock_anthropic_client():
+    """Create mock Anthropic client once per module; reset between tests"""
+    # patch.object skips the dotted-path target resolution of patch(str)
+    patcher = patch.object(ai_generator_module.anthropic, "Anthropic")
+    mock = patcher.start()
+    yield mock.return_value
+    patcher.stop()
+
+
+@pytest.fixture(scope="module")
+def ai_generator(mock_anthropic_client):
+    """Create AI generator with mocked client (stateless across tests)"""
+    return AIGenerator(api_key="test_key", model="test_model")
+
+
+@pytest.fixture(autouse=True)
+def _reset_mocked_state(mock_anthropic_client, ai_generator):
+    """Reset recorded calls, configured behavior, and cached responses"""
+    mock_anthropic_client.reset_mock(return_value=True, side_effect=True)
+    ai_generator._response_cache.clear()
+
+
+@pytest.fixture
+def script_tool_rounds(mock_anthropic_client):
+    """Script one tool round per query followed by a streamed synthesis"""
+
+    def _script(queries, final_text):
+        mock_anthropic_client.messages.create.side_effect = iter(
+            [
+                _tool_response(_tool_use(query, f"tool_{i}"))
+                for i, query in enumerate(queries, start=1)
+            ]
+        )
+        mock_anthropic_client.messages.stream.return_value.__enter__.return_value.text_stream = iter(
+            [final_text]
+        )
+
+    return _script
 
 
 class TestAIGenerator:
     """Test AI Generator's ability to call tools correctly"""
 
-    @pytest.fixture
-    def mock_anthropic_client(self):
-        """Create mock Anthropic client"""
-        with patch("ai_generator.anthropic.Anthropic") as mock:
-            yield mock.return_value
-
-    @pytest.fixture
-    def ai_generator(self, mock_anthropic_client):
-        """Create AI generator with mocked client"""
-        return AIGenerator(api_key="test_key", model="test_model")
-
     @pytest.fixture
     def mock_tool_manager(self):
         """Create mock tool manager"""
-        manager = Mock()
-        manager.get_tool_definitions.return_value = [
-            {
-                "name": "search_course_content",
-                "description": "Search course materials",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {"query": {"type": "string"}},
-                    "required": ["query"],
-                },
-            }
-        ]
-        manager.execute_tool.return_value = (
-            "Search results: Python is a programming language"
-        )
+        manager = _make_tool_manager()
+        manager.execute_tool.return_value = _SEARCH_RESULT
         return manager
 
-    def test_generate_response_without_tools(self, ai_generator, mock_anthropic_client):
-        """Test generating response without tools"""
+    @pytest.mark.parametrize(
+        "generate_kwargs, expected_params",
+        [
+            pytest.param(
+                {},
+                {"model": "test_model", "temperature": 0, "max_tokens": 800},
+                id="api-parameters",
+            ),
+            pytest.param(
+                {
+                    "conversation_history": (
+                        "User: Previous question\nAssistant: Previous answer"
+                    )
+                },
+                {},
+                id="conversation-history",
+            ),
+            pytest.param(
+                {"use_tools": True},
+                {"tool_choice": {"type": "auto"}},
+                id="tool-choice-auto",
+            ),
+        ],
+    )
+    def test_generate_response_call_parameters(
+        self,
+        ai_generator,
+        mock_anthropic_client,
+        mock_tool_manager,
+        generate_kwargs,
+        expected_params,
+    ):
+        """Test the parameters sent to the API for each generate_response shape"""
         # Configure mock response
-        mock_response = Mock()
-        mock_response.content = [Mock(text="This is a response")]
-        mock_response.stop_reason = "stop"
+        mock_response = SimpleNamespace(
+            content=[TextBlock(text="This is a response")], stop_reason="stop"
+        )
         mock_anthropic_client.messages.create.return_value = mock_response
 
-        # Generate response
-        result = ai_generator.generate_response("What is Python?")
+        kwargs = dict(generate_kwargs)
+        if kwargs.pop("use_tools", False):
+            kwargs["tools"] = _TOOL_DEFS_LIST
+            kwargs["tool_manager"] = mock_tool_manager
 
-        # Check result
+        # Generate response
+        result = ai_generator.generate_response("What is Python?", **kwargs)
         assert result == "This is a response"
         mock_anthropic_client.messages.create.assert_called_once()
 
+        # Check API call parameters
+        call_args = mock_anthropic_client.messages.create.call_args
+        for param, expected in expected_params.items():
+            assert call_args[1][param] == expected
+
+        # History must land in the system content blocks
+        history = generate_kwargs.get("conversation_history")
+        if history:
+            system_text = "".join(block["text"] for block in call_args[1]["system"])
+            assert "Previous conversation:" in system_text
+            assert history in system_text
+
     def test_generate_response_with_tool_call(
         self, ai_generator, mock_anthropic_client, mock_tool_manager
     ):
         """Test that AI generator correctly calls tools"""
         # Create mock tool use content
-        mock_tool_use = Mock()
-        mock_tool_use.type = "tool_use"
-        mock_tool_use.name = "search_course_content"
-        mock_tool_use.input = {"query": "Python basics"}
-        mock_tool_use.id = "tool_123"
+        mock_tool_use = _tool_use("Python basics", "tool_123")
 
         # Configure initial response with tool use
-        mock_initial_response = Mock()
-        mock_initial_response.content = [mock_tool_use]
-        mock_initial_response.stop_reason = "tool_use"
+        mock_initial_response = _tool_response(mock_tool_use)
 
         # Configure follow-up response
-        mock_final_response = Mock()
-        mock_final_response.content = [
-            Mock(text="Based on the search, Python is a programming language")
-        ]
+        mock_final_response = SimpleNamespace(
+            content=[
+                TextBlock(text="Based on the search, Python is a programming language")
+            ],
+            stop_reason="end_turn",
+        )
 
         # Set up the mock to return different responses
-        mock_anthropic_client.messages.create.side_effect = [
-            mock_initial_response,
-            mock_final_response,
-        ]
+        mock_anthropic_client.messages.create.side_effect = iter(
+            [
+                mock_initial_response,
+                mock_final_response,
+            ]
+        )
 
         # Generate response with tools
         result = ai_generator.generate_response(
             "What is Python?",
-            tools=mock_tool_manager.get_tool_definitions(),
+            tools=_TOOL_DEFS_LIST,
             tool_manager=mock_tool_manager,
         )
 
@@ -101,26 +213,116 @@ class TestAIGenerator:
         # Verify final response
         assert "Based on the search" in result
 
+    def test_response_cache_hit(self, ai_generator, mock_anthropic_client):
+        """Test that identical queries are served from the response cache"""
+        # Configure mock response
+        mock_response = SimpleNamespace(
+            content=[TextBlock(text="Cached response")], stop_reason="stop"
+        )
+        mock_anthropic_client.messages.create.return_value = mock_response
+
+        # Issue the same query twice
+        first = ai_generator.generate_response("What is Python?")
+        second = ai_generator.generate_response("What is Python?")
+
+        # Second call should be served from cache without another API call
+        assert first == second == "Cached response"
+        mock_anthropic_client.messages.create.assert_called_once()
+
+    def test_tool_path_bypasses_response_cache(
+        self, ai_generator, mock_anthropic_client, mock_tool_manager
+    ):
+        """Test that tool-using queries are never served from the cache"""
+        mock_response = SimpleNamespace(
+            content=[TextBlock(text="Tool-path answer")], stop_reason="stop"
+        )
+        mock_anthropic_client.messages.create.return_value = mock_response
+
+        # The same query twice with tools must hit the API both times,
+        # since sources live in the tool manager and a cached hit would
+        # return an answer with no citations
+        for _ in range(2):
+            ai_generator.generate_response(
+                "What is Python?",
+                tools=_TOOL_DEFS_LIST,
+                tool_manager=mock_tool_manager,
+            )
+
+        assert mock_anthropic_client.messages.create.call_count == 2
+
+    def test_response_cache_key_components_cannot_alias(self, ai_generator):
+        """Test that query/history boundaries can't produce colliding keys"""
+        key_one = ai_generator._response_cache_key("a||b", "c")
+        key_two = ai_generator._response_cache_key("a", "b||c")
+
+        assert key_one != key_two
+
+    def test_response_cache_distinguishes_history(
+        self, ai_generator, mock_anthropic_client
+    ):
+        """Test that different conversation history bypasses the cache"""
+        mock_response = SimpleNamespace(
+            content=[TextBlock(text="Response")], stop_reason="stop"
+        )
+        mock_anthropic_client.messages.create.return_value = mock_response
+
+        ai_generator.generate_response("Query")
+        ai_generator.generate_response("Query", conversation_history="User: hi")
+
+        assert mock_anthropic_client.messages.create.call_count == 2
+
+    def test_generate_responses_batch(self, ai_generator, mock_anthropic_client):
+        """Test that batch generation submits, polls, and orders results"""
+        # Batch completes immediately
+        mock_batch = SimpleNamespace(id="batch_123", processing_status="ended")
+        mock_anthropic_client.messages.batches.create.return_value = mock_batch
+
+        # Results arrive out of order
+        result_1 = SimpleNamespace(
+            custom_id="query-1",
+            result=SimpleNamespace(
+                type="succeeded",
+                message=SimpleNamespace(content=[TextBlock(text="Second answer")]),
+            ),
+        )
+
+        result_0 = SimpleNamespace(
+            custom_id="query-0",
+            result=SimpleNamespace(
+                type="succeeded",
+                message=SimpleNamespace(content=[TextBlock(text="First answer")]),
+            ),
+        )
+
+        mock_anthropic_client.messages.batches.results.return_value = [
+            result_1,
+            result_0,
+        ]
+
+        responses = ai_generator.generate_responses_batch(
+            [("What is Python?", None), ("What is Java?", None)]
+        )
+
+        # Results come back in input order regardless of completion order
+        assert responses == ["First answer", "Second answer"]
+        mock_anthropic_client.messages.batches.create.assert_called_once()
+
     def test_handle_tool_execution(
         self, ai_generator, mock_anthropic_client, mock_tool_manager
     ):
         """Test _handle_tool_execution method"""
         # Create mock tool use
-        mock_tool_use = Mock()
-        mock_tool_use.type = "tool_use"
-        mock_tool_use.name = "search_course_content"
-        mock_tool_use.input = {"query": "decorators"}
-        mock_tool_use.id = "tool_456"
+        mock_tool_use = _tool_use("decorators", "tool_456")
 
         # Create initial response
-        mock_initial_response = Mock()
-        mock_initial_response.content = [mock_tool_use]
+        mock_initial_response = SimpleNamespace(content=[mock_tool_use])
 
         # Create final response
-        mock_final_response = Mock()
-        mock_final_response.content = [
-            Mock(text="Decorators are functions that modify other functions")
-        ]
+        mock_final_response = SimpleNamespace(
+            content=[
+                TextBlock(text="Decorators are functions that modify other functions")
+            ]
+        )
 
         mock_anthropic_client.messages.create.return_value = mock_final_response
 
@@ -142,27 +344,6 @@ class TestAIGenerator:
         # Verify result
         assert "Decorators are functions" in result
 
-    def test_conversation_history_integration(
-        self, ai_generator, mock_anthropic_client
-    ):
-        """Test that conversation history is properly integrated"""
-        # Configure mock response
-        mock_response = Mock()
-        mock_response.content = [Mock(text="Response with history")]
-        mock_response.stop_reason = "stop"
-        mock_anthropic_client.messages.create.return_value = mock_response
-
-        # Generate response with history
-        history = "User: Previous question\nAssistant: Previous answer"
-        result = ai_generator.generate_response(
-            "New question", conversation_history=history
-        )
-
-        # Verify history was included in system prompt
-        call_args = mock_anthropic_client.messages.create.call_args
-        assert "Previous conversation:" in call_args[1]["system"]
-        assert history in call_args[1]["system"]
-
     def test_system_prompt_structure(self, ai_generator):
         """Test that system prompt is properly structured"""
         assert "course materials" in ai_generator.SYSTEM_PROMPT
@@ -170,75 +351,14 @@ class TestAIGenerator:
         assert "Up to 2 sequential searches" in ai_generator.SYSTEM_PROMPT
         assert "Sequential Search Strategy" in ai_generator.SYSTEM_PROMPT
 
-    def test_api_parameters(self, ai_generator, mock_anthropic_client):
-        """Test that API parameters are correctly set"""
-        # Configure mock response
-        mock_response = Mock()
-        mock_response.content = [Mock(text="Test response")]
-        mock_response.stop_reason = "stop"
-        mock_anthropic_client.messages.create.return_value = mock_response
-
-        # Generate response
-        ai_generator.generate_response("Test query")
-
-        # Check API call parameters
-        call_args = mock_anthropic_client.messages.create.call_args
-        assert call_args[1]["model"] == "test_model"
-        assert call_args[1]["temperature"] == 0
-        assert call_args[1]["max_tokens"] == 800
-
-    def test_tool_choice_auto(
-        self, ai_generator, mock_anthropic_client, mock_tool_manager
-    ):
-        """Test that tool_choice is set to auto when tools are provided"""
-        # Configure mock response
-        mock_response = Mock()
-        mock_response.content = [Mock(text="Response")]
-        mock_response.stop_reason = "stop"
-        mock_anthropic_client.messages.create.return_value = mock_response
-
-        # Generate response with tools and tool_manager
-        ai_generator.generate_response(
-            "Query",
-            tools=mock_tool_manager.get_tool_definitions(),
-            tool_manager=mock_tool_manager,
-        )
-
-        # Verify tool_choice was set in the sequential tool execution path
-        call_args = mock_anthropic_client.messages.create.call_args
-        assert "tool_choice" in call_args[1]
-        assert call_args[1]["tool_choice"]["type"] == "auto"
-
 
 class TestSequentialToolCalling:
     """Test sequential tool calling functionality"""
 
-    @pytest.fixture
-    def mock_anthropic_client(self):
-        """Create mock Anthropic client"""
-        with patch("ai_generator.anthropic.Anthropic") as mock:
-            yield mock.return_value
-
-    @pytest.fixture
-    def ai_generator(self, mock_anthropic_client):
-        """Create AI generator with mocked client"""
-        return AIGenerator(api_key="test_key", model="test_model")
-
     @pytest.fixture
     def mock_tool_manager(self):
         """Create mock tool manager"""
-        manager = Mock()
-        manager.get_tool_definitions.return_value = [
-            {
-                "name": "search_course_content",
-                "description": "Search course materials",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {"query": {"type": "string"}},
-                    "required": ["query"],
-                },
-            }
-        ]
+        manager = _make_tool_manager()
         # Different results for different searches
         manager.execute_tool.side_effect = [
             "First search result: Python basics information",
@@ -251,32 +371,29 @@ class TestSequentialToolCalling:
     ):
         """Test that single tool calls still work (backwards compatibility)"""
         # Create mock tool use content
-        mock_tool_use = Mock()
-        mock_tool_use.type = "tool_use"
-        mock_tool_use.name = "search_course_content"
-        mock_tool_use.input = {"query": "Python basics"}
-        mock_tool_use.id = "tool_123"
+        mock_tool_use = _tool_use("Python basics", "tool_123")
 
         # Configure initial response with tool use
-        mock_initial_response = Mock()
-        mock_initial_response.content = [mock_tool_use]
-        mock_initial_response.stop_reason = "tool_use"
+        mock_initial_response = _tool_response(mock_tool_use)
 
         # Configure follow-up response without tools
-        mock_final_response = Mock()
-        mock_final_response.content = [Mock(text="Python is a programming language")]
-        mock_final_response.stop_reason = "stop"
+        mock_final_response = SimpleNamespace(
+            content=[TextBlock(text="Python is a programming language")],
+            stop_reason="stop",
+        )
 
         # Set up the mock to return different responses
-        mock_anthropic_client.messages.create.side_effect = [
-            mock_initial_response,
-            mock_final_response,
-        ]
+        mock_anthropic_client.messages.create.side_effect = iter(
+            [
+                mock_initial_response,
+                mock_final_response,
+            ]
+        )
 
         # Generate response with tools
         result = ai_generator.generate_response(
             "What is Python?",
-            tools=mock_tool_manager.get_tool_definitions(),
+            tools=_TOOL_DEFS_LIST,
             tool_manager=mock_tool_manager,
             max_tool_rounds=2,
         )
@@ -285,49 +402,20 @@ class TestSequentialToolCalling:
         assert mock_tool_manager.execute_tool.call_count == 1
         assert "Python is a programming language" in result
 
+    @pytest.mark.slow
     def test_sequential_tool_calls_two_rounds(
-        self, ai_generator, mock_anthropic_client, mock_tool_manager
+        self, ai_generator, mock_tool_manager, script_tool_rounds
     ):
         """Test that sequential tool calls work for two rounds"""
-        # Create mock tool use content for first round
-        mock_tool_use_1 = Mock()
-        mock_tool_use_1.type = "tool_use"
-        mock_tool_use_1.name = "search_course_content"
-        mock_tool_use_1.input = {"query": "Python basics"}
-        mock_tool_use_1.id = "tool_123"
-
-        # Create mock tool use content for second round
-        mock_tool_use_2 = Mock()
-        mock_tool_use_2.type = "tool_use"
-        mock_tool_use_2.name = "search_course_content"
-        mock_tool_use_2.input = {"query": "Python advanced"}
-        mock_tool_use_2.id = "tool_456"
-
-        # Configure responses
-        mock_response_1 = Mock()
-        mock_response_1.content = [mock_tool_use_1]
-        mock_response_1.stop_reason = "tool_use"
-
-        mock_response_2 = Mock()
-        mock_response_2.content = [mock_tool_use_2]
-        mock_response_2.stop_reason = "tool_use"
-
-        mock_final_response = Mock()
-        mock_final_response.content = [
-            Mock(text="Comprehensive Python answer covering basics and advanced topics")
-        ]
-        mock_final_response.stop_reason = "stop"
-
-        mock_anthropic_client.messages.create.side_effect = [
-            mock_response_1,
-            mock_response_2,
-            mock_final_response,
-        ]
+        script_tool_rounds(
+            ["Python basics", "Python advanced"],
+            "Comprehensive Python answer covering basics and advanced topics",
+        )
 
         # Generate response
         result = ai_generator.generate_response(
             "Tell me about Python programming from basics to advanced",
-            tools=mock_tool_manager.get_tool_definitions(),
+            tools=_TOOL_DEFS_LIST,
             tool_manager=mock_tool_manager,
             max_tool_rounds=2,
         )
@@ -336,36 +424,20 @@ class TestSequentialToolCalling:
         assert mock_tool_manager.execute_tool.call_count == 2
         assert "Comprehensive Python answer" in result
 
+    @pytest.mark.slow
     def test_max_rounds_enforcement(
-        self, ai_generator, mock_anthropic_client, mock_tool_manager
+        self, ai_generator, mock_tool_manager, script_tool_rounds
     ):
         """Test that max rounds limit is enforced"""
-        # Create tool use responses that would continue indefinitely
-        mock_tool_use = Mock()
-        mock_tool_use.type = "tool_use"
-        mock_tool_use.name = "search_course_content"
-        mock_tool_use.input = {"query": "test"}
-        mock_tool_use.id = "tool_123"
-
-        mock_tool_response = Mock()
-        mock_tool_response.content = [mock_tool_use]
-        mock_tool_response.stop_reason = "tool_use"
-
-        mock_final_response = Mock()
-        mock_final_response.content = [Mock(text="Final response after max rounds")]
-        mock_final_response.stop_reason = "stop"
-
-        # Mock to always return tool use for first two calls, then final response
-        mock_anthropic_client.messages.create.side_effect = [
-            mock_tool_response,  # Round 1
-            mock_tool_response,  # Round 2
-            mock_final_response,  # Final synthesis
-        ]
+        # Tool use on both rounds would continue indefinitely without the cap
+        script_tool_rounds(
+            ["first search", "second search"], "Final response after max rounds"
+        )
 
         # Generate response with max_tool_rounds=2
         result = ai_generator.generate_response(
             "Test query",
-            tools=mock_tool_manager.get_tool_definitions(),
+            tools=_TOOL_DEFS_LIST,
             tool_manager=mock_tool_manager,
             max_tool_rounds=2,
         )
@@ -374,6 +446,88 @@ class TestSequentialToolCalling:
         assert mock_tool_manager.execute_tool.call_count == 2
         assert "Final response after max rounds" in result
 
+    def test_duplicate_tool_calls_share_one_execution(
+        self, ai_generator, mock_anthropic_client, mock_tool_manager
+    ):
+        """Test that identical tool calls in one round execute the tool once"""
+        mock_tool_manager.execute_tool.side_effect = None
+        mock_tool_manager.execute_tool.return_value = "Shared search result"
+
+        # Claude hedges with two identical searches in the same round
+        mock_tool_use_1 = _tool_use("Python basics", "tool_1")
+
+        mock_tool_use_2 = _tool_use("Python basics", "tool_2")
+
+        mock_tool_response = SimpleNamespace(
+            content=[mock_tool_use_1, mock_tool_use_2], stop_reason="tool_use"
+        )
+
+        mock_final_response = SimpleNamespace(
+            content=[TextBlock(text="Answer")], stop_reason="stop"
+        )
+
+        mock_anthropic_client.messages.create.side_effect = iter(
+            [
+                mock_tool_response,
+                mock_final_response,
+            ]
+        )
+
+        result = ai_generator.generate_response(
+            "What is Python?",
+            tools=_TOOL_DEFS_LIST,
+            tool_manager=mock_tool_manager,
+        )
+
+        # The tool ran once, but each tool_use_id got its own result
+        assert mock_tool_manager.execute_tool.call_count == 1
+        second_message = mock_anthropic_client.messages.create.call_args_list[1]
+        tool_result_ids = [
+            block["tool_use_id"]
+            for block in second_message[1]["messages"][2]["content"]
+        ]
+        assert tool_result_ids == ["tool_1", "tool_2"]
+        assert result == "Answer"
+
+    def test_narration_does_not_replace_synthesis(
+        self, ai_generator, mock_anthropic_client, mock_tool_manager
+    ):
+        """Test that narration beside final-round tool_use doesn't skip synthesis"""
+        mock_tool_use = _tool_use("test", "tool_123")
+
+        mock_tool_response = _tool_response(mock_tool_use)
+
+        # Final round mixes narration with another tool_use; the narration
+        # predates that round's search results and must not become the answer
+        mock_narration_block = SimpleNamespace(
+            type="text", text="I'll search for more details..."
+        )
+
+        mock_mixed_response = SimpleNamespace(
+            content=[mock_narration_block, mock_tool_use], stop_reason="tool_use"
+        )
+
+        mock_anthropic_client.messages.create.side_effect = iter(
+            [
+                mock_tool_response,
+                mock_mixed_response,
+            ]
+        )
+        mock_anthropic_client.messages.stream.return_value.__enter__.return_value.text_stream = iter(
+            ["Synthesized answer from all searches"]
+        )
+
+        result = ai_generator.generate_response(
+            "Test query",
+            tools=_TOOL_DEFS_LIST,
+            tool_manager=mock_tool_manager,
+            max_tool_rounds=2,
+        )
+
+        # Synthesis still runs and its result wins over the narration
+        assert result == "Synthesized answer from all searches"
+        assert mock_anthropic_client.messages.stream.call_count == 1
+
     def test_tool_execution_failure_handling(
         self, ai_generator, mock_anthropic_client, mock_tool_manager
     ):
@@ -382,33 +536,28 @@ class TestSequentialToolCalling:
         mock_tool_manager.execute_tool.side_effect = Exception("Tool execution error")
 
         # Create mock tool use content
-        mock_tool_use = Mock()
-        mock_tool_use.type = "tool_use"
-        mock_tool_use.name = "search_course_content"
-        mock_tool_use.input = {"query": "test"}
-        mock_tool_use.id = "tool_123"
+        mock_tool_use = _tool_use("test", "tool_123")
 
-        mock_tool_response = Mock()
-        mock_tool_response.content = [mock_tool_use]
-        mock_tool_response.stop_reason = "tool_use"
+        mock_tool_response = _tool_response(mock_tool_use)
 
         # Mock final response after tool failure
-        mock_final_response = Mock()
-        mock_final_response.content = [
-            Mock(text="I apologize, but I couldn't complete the search")
-        ]
-        mock_final_response.stop_reason = "stop"
+        mock_final_response = SimpleNamespace(
+            content=[TextBlock(text="I apologize, but I couldn't complete the search")],
+            stop_reason="stop",
+        )
 
         # Tool execution fails, but we should get a final response
-        mock_anthropic_client.messages.create.side_effect = [
-            mock_tool_response,
-            mock_final_response,
-        ]
+        mock_anthropic_client.messages.create.side_effect = iter(
+            [
+                mock_tool_response,
+                mock_final_response,
+            ]
+        )
 
         # Generate response
         result = ai_generator.generate_response(
             "Test query",
-            tools=mock_tool_manager.get_tool_definitions(),
+            tools=_TOOL_DEFS_LIST,
             tool_manager=mock_tool_manager,
         )
 
@@ -417,8 +566,9 @@ class TestSequentialToolCalling:
         assert isinstance(result, str)
         assert "apologize" in result.lower() or "couldn't" in result.lower()
 
+    @pytest.mark.slow
     def test_context_accumulation_between_rounds(
-        self, ai_generator, mock_anthropic_client, mock_tool_manager
+        self, ai_generator, mock_anthropic_client, mock_tool_manager, script_tool_rounds
     ):
         """Test that context accumulates properly between rounds"""
         # Mock two tool calls with different results
@@ -427,62 +577,61 @@ class TestSequentialToolCalling:
             "Second result about Java",
         ]
 
-        # Create tool use mocks
-        mock_tool_use_1 = Mock()
-        mock_tool_use_1.type = "tool_use"
-        mock_tool_use_1.name = "search_course_content"
-        mock_tool_use_1.input = {"query": "Python"}
-        mock_tool_use_1.id = "tool_1"
-
-        mock_tool_use_2 = Mock()
-        mock_tool_use_2.type = "tool_use"
-        mock_tool_use_2.name = "search_course_content"
-        mock_tool_use_2.input = {"query": "Java"}
-        mock_tool_use_2.id = "tool_2"
-
-        # Create responses
-        mock_response_1 = Mock()
-        mock_response_1.content = [mock_tool_use_1]
-        mock_response_1.stop_reason = "tool_use"
-
-        mock_response_2 = Mock()
-        mock_response_2.content = [mock_tool_use_2]
-        mock_response_2.stop_reason = "tool_use"
-
-        mock_final_response = Mock()
-        mock_final_response.content = [Mock(text="Comparison of Python and Java")]
-        mock_final_response.stop_reason = "stop"
-
-        mock_anthropic_client.messages.create.side_effect = [
-            mock_response_1,
-            mock_response_2,
-            mock_final_response,
-        ]
+        script_tool_rounds(["Python", "Java"], "Comparison of Python and Java")
 
         # Generate response
         result = ai_generator.generate_response(
             "Compare Python and Java",
-            tools=mock_tool_manager.get_tool_definitions(),
+            tools=_TOOL_DEFS_LIST,
             tool_manager=mock_tool_manager,
         )
 
         # Verify context was included in second round
         # Check that the second API call included previous search results in system prompt
-        assert mock_anthropic_client.messages.create.call_count == 3
+        assert mock_anthropic_client.messages.create.call_count == 2
+        assert mock_anthropic_client.messages.stream.call_count == 1
 
         # Get the second call (round 2) system content
         second_call_args = mock_anthropic_client.messages.create.call_args_list[1]
-        system_content = second_call_args[1]["system"]
+        system_text = "".join(block["text"] for block in second_call_args[1]["system"])
 
         # Should contain previous search results
-        assert "Previous search results:" in system_content
-        assert "Round 1:" in system_content
+        assert "Previous search results:" in system_text
+        assert "Round 1:" in system_text
+
+    def test_context_summary_truncates_old_rounds(self, ai_generator):
+        """Test that the summarized context is bounded, dropping oldest rounds"""
+        long_result = "x" * 300
+        accumulated_context = [
+            {
+                "round": round_num,
+                "tool_executions": [
+                    {
+                        "tool_name": "search_course_content",
+                        "input": {"query": "test"},
+                        "result": long_result,
+                        "execution_time": 0.1,
+                        "success": True,
+                    }
+                ]
+                * 10,
+            }
+            for round_num in range(1, 6)
+        ]
+
+        summary = ai_generator._summarize_tool_context(accumulated_context)
+
+        # Latest round is always kept; oldest rounds get truncated away
+        assert "Round 5:" in summary
+        assert "Round 1:" not in summary
+        assert "... (earlier rounds truncated)" in summary
 
     def test_no_tools_direct_response(self, ai_generator, mock_anthropic_client):
         """Test direct response when Claude doesn't use tools"""
-        mock_response = Mock()
-        mock_response.content = [Mock(text="Direct answer without tools")]
-        mock_response.stop_reason = "stop"
+        mock_response = SimpleNamespace(
+            content=[TextBlock(text="Direct answer without tools")],
+            stop_reason="stop",
+        )
 
         mock_anthropic_client.messages.create.return_value = mock_response
 
@@ -497,79 +646,110 @@ class TestSequentialToolCalling:
         assert result == "Direct answer without tools"
 
 
-class TestToolCallTracker:
-    """Test the ToolCallTracker class"""
+class TestTokenBucket:
+    """Test the TokenBucket rate limiter"""
 
-    def test_tracker_initialization(self):
-        """Test tracker initializes correctly"""
-        tracker = ToolCallTracker(max_rounds=2)
+    def test_acquire_decrements_allowances(self):
+        """Test that acquiring consumes request and token budget"""
+        bucket = TokenBucket(rpm=10, tpm=1000)
 
-        assert tracker.max_rounds == 2
-        assert tracker.current_round == 0
-        assert tracker.tool_calls_made == []
-        assert tracker.execution_times == []
-        assert tracker.errors == []
+        bucket.acquire(estimated_tokens=400)
 
-    def test_can_make_tool_call(self):
-        """Test tool call availability check"""
-        tracker = ToolCallTracker(max_rounds=2)
+        assert bucket._request_allowance <= 9
+        assert bucket._token_allowance <= 600
 
-        # Initially should be able to make calls
-        assert tracker.can_make_tool_call() == True
+    def test_refund_restores_tokens(self):
+        """Test that refunded tokens go back into the budget, capped at tpm"""
+        bucket = TokenBucket(rpm=10, tpm=1000)
+        bucket.acquire(estimated_tokens=400)
 
-        # After max rounds reached
-        tracker.current_round = 2
-        assert tracker.can_make_tool_call() == False
+        bucket.refund(400)
 
-    def test_start_round(self):
-        """Test starting new rounds"""
-        tracker = ToolCallTracker(max_rounds=2)
+        assert bucket._token_allowance <= 1000
+        assert bucket._token_allowance >= 999
 
-        # Start first round
-        round_num = tracker.start_round()
-        assert round_num == 1
-        assert tracker.current_round == 1
+    def test_oversized_estimate_is_clamped(self):
+        """Test that an estimate above tpm acquires instead of spinning forever"""
+        bucket = TokenBucket(rpm=10, tpm=1000)
 
-        # Start second round
-        round_num = tracker.start_round()
-        assert round_num == 2
-        assert tracker.current_round == 2
+        # Would never be satisfiable without clamping
+        bucket.acquire(estimated_tokens=5000)
 
-    def test_log_tool_call(self):
-        """Test logging tool calls"""
-        tracker = ToolCallTracker(max_rounds=2)
-        tracker.start_round()
+        assert bucket._token_allowance <= 0
 
-        # Log successful call
-        tracker.log_tool_call("search", {"query": "test"}, 0.5, True)
+    def test_allowance_refills_over_time(self):
+        """Test that allowances refill proportionally to elapsed time"""
+        bucket = TokenBucket(rpm=60, tpm=6000)
+        bucket.acquire(estimated_tokens=1000)
 
-        assert len(tracker.tool_calls_made) == 1
-        assert tracker.tool_calls_made[0]["tool_name"] == "search"
-        assert tracker.tool_calls_made[0]["success"] == True
-        assert len(tracker.execution_times) == 1
+        # Simulate one second passing
+        bucket._last_refill -= 1.0
+        bucket._refill()
 
-        # Log failed call
-        tracker.log_tool_call("search", {"query": "test2"}, 0.3, False, "Error message")
+        assert bucket._request_allowance >= 59.9
+        assert bucket._token_allowance >= 5099
 
-        assert len(tracker.tool_calls_made) == 2
-        assert tracker.tool_calls_made[1]["success"] == False
-        assert len(tracker.errors) == 1
-        assert tracker.errors[0] == "Error message"
 
-    def test_get_summary(self):
-        """Test getting execution summary"""
-        tracker = ToolCallTracker(max_rounds=2)
-        tracker.start_round()
+class TestToolCallTracker:
+    """Test the ToolCallTracker class"""
 
-        # Log some calls
-        tracker.log_tool_call("search", {"query": "test1"}, 0.5, True)
-        tracker.log_tool_call("search", {"query": "test2"}, 0.3, False, "Error")
+    @pytest.mark.parametrize(
+        "operations, expected",
+        [
+            pytest.param(
+                [],
+                {
+                    "max_rounds": 2,
+                    "current_round": 0,
+                    "tool_calls_made": [],
+                    "execution_times": [],
+                    "errors": [],
+                    "can_make_tool_call": True,
+                },
+                id="initialization",
+            ),
+            pytest.param(
+                [("start_round", ())],
+                {"current_round": 1, "can_make_tool_call": True},
+                id="first-round",
+            ),
+            pytest.param(
+                [("start_round", ()), ("start_round", ())],
+                {"current_round": 2, "can_make_tool_call": False},
+                id="rounds-exhausted",
+            ),
+            pytest.param(
+                [
+                    ("start_round", ()),
+                    ("log_tool_call", ("search", {"query": "test1"}, 0.5, True)),
+                    (
+                        "log_tool_call",
+                        ("search", {"query": "test2"}, 0.3, False, "Error message"),
+                    ),
+                ],
+                {
+                    "errors": ["Error message"],
+                    "execution_times": [0.5, 0.3],
+                    "get_summary": {
+                        "total_rounds": 1,
+                        "total_tool_calls": 2,
+                        "successful_calls": 1,
+                        "failed_calls": 1,
+                        "total_execution_time": 0.8,
+                        "errors": ["Error message"],
+                    },
+                },
+                id="logged-calls",
+            ),
+        ],
+    )
+    def test_tracker_behavior(self, operations, expected):
+        """Test tracker state after each sequence of operations"""
+        tracker = ToolCallTracker(max_rounds=2)
 
-        summary = tracker.get_summary()
+        for method, args in operations:
+            getattr(tracker, method)(*args)
 
-        assert summary["total_rounds"] == 1
-        assert summary["total_tool_calls"] == 2
-        assert summary["successful_calls"] == 1
-        assert summary["failed_calls"] == 1
-        assert summary["total_execution_time"] == 0.8
-        assert len(summary["errors"]) == 1
+        for name, value in expected.items():
+            attr = getattr(tracker, name)
+            assert (attr() if callable(attr) else attr) == value
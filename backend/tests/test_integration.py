@@ -4,64 +4,62 @@ Integration test to verify the RAG system is working correctly after the fix.
 This test uses the actual system with real ChromaDB data.
 """
 
-import os
-import sys
+import functools
+from unittest.mock import patch
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
 
-from config import config
-from rag_system import RAGSystem
-from vector_store import VectorStore
+# Loading the real embedding model is expensive; only run with -m integration.
+# The heavy rag_system/vector_store imports (chromadb, torch) stay inside the
+# test so collection of a deselected module remains cheap.
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(autouse=True, scope="module")
+def shared_embedding_model():
+    """Share one SentenceTransformer instance across the module
+
+    The test constructs a VectorStore directly and another one inside
+    RAGSystem; caching the constructor means both share the same loaded
+    weights instead of materializing the model twice.
+    """
+    import sentence_transformers
+
+    cached_constructor = functools.lru_cache(maxsize=None)(
+        sentence_transformers.SentenceTransformer
+    )
+    with patch.object(sentence_transformers, "SentenceTransformer", cached_constructor):
+        yield
 
 
 def test_rag_query_after_fix():
     """Test that RAG queries work after fixing MAX_RESULTS"""
-    print("\n=== RAG System Integration Test ===\n")
+    from config import config
+    from rag_system import RAGSystem
+    from vector_store import VectorStore
 
     # Verify MAX_RESULTS is fixed
-    print(f"1. Configuration Check:")
-    print(f"   MAX_RESULTS = {config.MAX_RESULTS}")
     assert config.MAX_RESULTS > 0, "MAX_RESULTS must be greater than 0"
-    print("   ✓ MAX_RESULTS is properly configured\n")
 
-    # Test vector store directly
-    print(f"2. Vector Store Test:")
+    # The vector store honors the configured result limit
     vector_store = VectorStore(
         config.CHROMA_PATH, config.EMBEDDING_MODEL, config.MAX_RESULTS
     )
-    print(f"   Vector store initialized with max_results = {vector_store.max_results}")
-
-    # Check if we have data
-    course_count = vector_store.get_course_count()
-    print(f"   Courses in database: {course_count}")
+    assert vector_store.max_results == config.MAX_RESULTS
 
-    if course_count > 0:
-        # Try a search
+    # With indexed data, a search must return results without error
+    if vector_store.get_course_count() > 0:
         results = vector_store.search("computer use")
-        if not results.is_empty():
-            print(f"   ✓ Search returned {len(results.documents)} results\n")
-        else:
-            print(f"   ⚠ Search returned no results (data may need reindexing)\n")
-    else:
-        print(f"   ⚠ No courses in database (run app.py to index documents)\n")
+        assert results.error is None
+        assert not results.is_empty(), "search returned no results for indexed data"
 
-    # Test full RAG system
-    print(f"3. RAG System Test:")
+    # The full RAG system wires up every component
     rag_system = RAGSystem(config)
-    print(f"   RAG system initialized")
-    print(f"   - Document processor: ✓")
-    print(f"   - Vector store: ✓ (max_results={rag_system.vector_store.max_results})")
-    print(f"   - AI generator: ✓")
-    print(f"   - Tool manager: ✓")
-    print(f"   - Search tool registered: ✓\n")
-
-    print("=== Test Complete ===")
-    print("\nSummary:")
-    print("- The MAX_RESULTS bug has been fixed (was 0, now 5)")
-    print("- Vector store now properly returns search results")
-    print("- RAG system components are correctly initialized")
-    print("\nThe chatbot should now work correctly for content queries!")
+    assert rag_system.document_processor is not None
+    assert rag_system.vector_store.max_results == config.MAX_RESULTS
+    assert rag_system.ai_generator is not None
+    assert rag_system.tool_manager.get_tool_definitions()
 
 
 if __name__ == "__main__":
-    test_rag_query_after_fix()
+    pytest.main([__file__, "-m", "integration"])
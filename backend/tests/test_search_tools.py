@@ -1,148 +1,194 @@
-import os
-import sys
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from unittest.mock import MagicMock, Mock
-
 import pytest
 from search_tools import CourseSearchTool, ToolManager
 from vector_store import SearchResults
 
+# Canned results allocated once at import; CourseSearchTool only reads them
+RESULTS_PYTHON_BASICS = SearchResults(
+    documents=["Python is a programming language", "Variables store data"],
+    metadata=[
+        {"course_title": "Python Basics", "lesson_number": 0},
+        {"course_title": "Python Basics", "lesson_number": 1},
+    ],
+    distances=[0.1, 0.2],
+    error=None,
+)
+
+RESULTS_ADVANCED_COURSE = SearchResults(
+    documents=["Content from specific course"],
+    metadata=[{"course_title": "Advanced Python", "lesson_number": 0}],
+    distances=[0.1],
+    error=None,
+)
+
+RESULTS_LESSON_THREE = SearchResults(
+    documents=["Lesson specific content"],
+    metadata=[{"course_title": "Python Basics", "lesson_number": 3}],
+    distances=[0.1],
+    error=None,
+)
+
+RESULTS_TWO_COURSES = SearchResults(
+    documents=["Content 1", "Content 2"],
+    metadata=[
+        {"course_title": "Course A", "lesson_number": 0},
+        {"course_title": "Course B", "lesson_number": 2},
+    ],
+    distances=[0.1, 0.2],
+    error=None,
+)
+
+EMPTY_RESULTS = SearchResults(documents=[], metadata=[], distances=[], error=None)
+
+ERROR_RESULTS = SearchResults(
+    documents=[], metadata=[], distances=[], error="Database connection failed"
+)
+
+
+class StubVectorStore:
+    """Hand-written vector store stand-in that records search calls"""
+
+    def __init__(self):
+        self.calls = []
+        self.next_result = None
+
+    def search(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.next_result
+
+
+class StubTool:
+    """Hand-written tool stub with a fixed definition and recorded calls"""
+
+    def __init__(self, definition, result="Tool executed"):
+        self.definition = definition
+        self.result = result
+        self.calls = []
+        self.last_sources = []
+
+    def get_tool_definition(self):
+        return self.definition
+
+    def execute(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.result
+
 
 class TestCourseSearchTool:
     """Test the CourseSearchTool execute method"""
 
     @pytest.fixture
-    def mock_vector_store(self):
-        """Create a mock vector store"""
-        mock_store = Mock()
-        return mock_store
+    def mock_vector_store_cst(self):
+        """Create a stub vector store"""
+        return StubVectorStore()
 
     @pytest.fixture
-    def search_tool(self, mock_vector_store):
+    def search_tool_cst(self, mock_vector_store_cst):
         """Create search tool with mock vector store"""
-        return CourseSearchTool(mock_vector_store)
+        return CourseSearchTool(mock_vector_store_cst)
 
-    def test_execute_with_empty_results(self, search_tool, mock_vector_store):
+    def test_execute_with_empty_results(self, search_tool_cst, mock_vector_store_cst):
         """Test execute when vector store returns empty results"""
         # Configure mock to return empty results
-        empty_results = SearchResults(
-            documents=[], metadata=[], distances=[], error=None
-        )
-        mock_vector_store.search.return_value = empty_results
+        mock_vector_store_cst.next_result = EMPTY_RESULTS
 
         # Execute search
-        result = search_tool.execute(query="Python basics")
+        result = search_tool_cst.execute(query="Python basics")
 
         # Should return no content found message
         assert "No relevant content found" in result
-        mock_vector_store.search.assert_called_once_with(
-            query="Python basics", course_name=None, lesson_number=None
-        )
-
-    def test_execute_with_results(self, search_tool, mock_vector_store):
-        """Test execute when vector store returns results"""
-        # Configure mock to return results
-        results = SearchResults(
-            documents=["Python is a programming language", "Variables store data"],
-            metadata=[
-                {"course_title": "Python Basics", "lesson_number": 0},
-                {"course_title": "Python Basics", "lesson_number": 1},
-            ],
-            distances=[0.1, 0.2],
-            error=None,
-        )
-        mock_vector_store.search.return_value = results
-
-        # Execute search
-        result = search_tool.execute(query="Python programming")
-
-        # Should format results properly
-        assert "[Python Basics - Lesson 0]" in result
-        assert "[Python Basics - Lesson 1]" in result
-        assert "Python is a programming language" in result
-        assert "Variables store data" in result
-
-    def test_execute_with_course_filter(self, search_tool, mock_vector_store):
-        """Test execute with course name filter"""
-        # Configure mock
-        results = SearchResults(
-            documents=["Content from specific course"],
-            metadata=[{"course_title": "Advanced Python", "lesson_number": 0}],
-            distances=[0.1],
-            error=None,
-        )
-        mock_vector_store.search.return_value = results
-
-        # Execute search with course filter
-        result = search_tool.execute(query="decorators", course_name="Advanced Python")
-
-        # Verify course filter was passed
-        mock_vector_store.search.assert_called_once_with(
-            query="decorators", course_name="Advanced Python", lesson_number=None
-        )
-        assert "Advanced Python" in result
-
-    def test_execute_with_lesson_filter(self, search_tool, mock_vector_store):
-        """Test execute with lesson number filter"""
-        # Configure mock
-        results = SearchResults(
-            documents=["Lesson specific content"],
-            metadata=[{"course_title": "Python Basics", "lesson_number": 3}],
-            distances=[0.1],
-            error=None,
-        )
-        mock_vector_store.search.return_value = results
-
-        # Execute search with lesson filter
-        result = search_tool.execute(query="functions", lesson_number=3)
-
-        # Verify lesson filter was passed
-        mock_vector_store.search.assert_called_once_with(
-            query="functions", course_name=None, lesson_number=3
+        assert mock_vector_store_cst.calls == [
+            {"query": "Python basics", "course_name": None, "lesson_number": None}
+        ]
+
+    @pytest.mark.parametrize(
+        "query, course_name, lesson_number, results, expected_substrings",
+        [
+            pytest.param(
+                "Python programming",
+                None,
+                None,
+                RESULTS_PYTHON_BASICS,
+                [
+                    "[Python Basics - Lesson 0]",
+                    "[Python Basics - Lesson 1]",
+                    "Python is a programming language",
+                    "Variables store data",
+                ],
+                id="unfiltered",
+            ),
+            pytest.param(
+                "decorators",
+                "Advanced Python",
+                None,
+                RESULTS_ADVANCED_COURSE,
+                ["Advanced Python"],
+                id="course-filter",
+            ),
+            pytest.param(
+                "functions",
+                None,
+                3,
+                RESULTS_LESSON_THREE,
+                ["Lesson 3"],
+                id="lesson-filter",
+            ),
+        ],
+    )
+    def test_execute_passes_filters_and_formats(
+        self,
+        search_tool_cst,
+        mock_vector_store_cst,
+        query,
+        course_name,
+        lesson_number,
+        results,
+        expected_substrings,
+    ):
+        """Test that execute passes filters through and formats the results"""
+        mock_vector_store_cst.next_result = results
+
+        result = search_tool_cst.execute(
+            query=query, course_name=course_name, lesson_number=lesson_number
         )
-        assert "Lesson 3" in result
 
-    def test_execute_with_error(self, search_tool, mock_vector_store):
+        # Filters are passed through unchanged and results formatted
+        assert mock_vector_store_cst.calls == [
+            {
+                "query": query,
+                "course_name": course_name,
+                "lesson_number": lesson_number,
+            }
+        ]
+        for expected in expected_substrings:
+            assert expected in result
+
+    def test_execute_with_error(self, search_tool_cst, mock_vector_store_cst):
         """Test execute when vector store returns error"""
         # Configure mock to return error
-        error_results = SearchResults(
-            documents=[], metadata=[], distances=[], error="Database connection failed"
-        )
-        mock_vector_store.search.return_value = error_results
+        mock_vector_store_cst.next_result = ERROR_RESULTS
 
         # Execute search
-        result = search_tool.execute(query="test query")
+        result = search_tool_cst.execute(query="test query")
 
         # Should return error message
         assert result == "Database connection failed"
 
-    def test_source_tracking(self, search_tool, mock_vector_store):
+    def test_source_tracking(self, search_tool_cst, mock_vector_store_cst):
         """Test that sources are properly tracked"""
         # Configure mock to return results
-        results = SearchResults(
-            documents=["Content 1", "Content 2"],
-            metadata=[
-                {"course_title": "Course A", "lesson_number": 0},
-                {"course_title": "Course B", "lesson_number": 2},
-            ],
-            distances=[0.1, 0.2],
-            error=None,
-        )
-        mock_vector_store.search.return_value = results
+        mock_vector_store_cst.next_result = RESULTS_TWO_COURSES
 
         # Execute search
-        search_tool.execute(query="test")
+        search_tool_cst.execute(query="test")
 
         # Check sources are tracked
-        assert len(search_tool.last_sources) == 2
-        assert "Course A - Lesson 0" in search_tool.last_sources
-        assert "Course B - Lesson 2" in search_tool.last_sources
+        assert len(search_tool_cst.last_sources) == 2
+        assert "Course A - Lesson 0" in search_tool_cst.last_sources
+        assert "Course B - Lesson 2" in search_tool_cst.last_sources
 
-    def test_tool_definition(self, search_tool):
+    def test_tool_definition(self, search_tool_cst):
         """Test the tool definition for Anthropic"""
-        definition = search_tool.get_tool_definition()
+        definition = search_tool_cst.get_tool_definition()
 
         assert definition["name"] == "search_course_content"
         assert "description" in definition
@@ -156,74 +202,70 @@ class TestCourseSearchTool:
 class TestToolManager:
     """Test the ToolManager class"""
 
-    @pytest.fixture
-    def tool_manager(self):
-        """Create a tool manager"""
+    @pytest.fixture(scope="class")
+    def tool_manager_tm(self):
+        """Create one tool manager for the class
+
+        Registrations are idempotent per name and the tests only read
+        state they set up themselves, so sharing is safe.
+        """
         return ToolManager()
 
-    @pytest.fixture
-    def mock_tool(self):
-        """Create a mock tool"""
-        tool = Mock()
-        tool.get_tool_definition.return_value = {
-            "name": "test_tool",
-            "description": "Test tool",
-        }
-        tool.execute.return_value = "Tool executed"
-        return tool
-
-    def test_register_tool(self, tool_manager, mock_tool):
+    @pytest.fixture(scope="class")
+    def mock_tool_tm(self):
+        """Create a stub tool shared across the class"""
+        return StubTool({"name": "test_tool", "description": "Test tool"})
+
+    def test_register_tool(self, tool_manager_tm, mock_tool_tm):
         """Test registering a tool"""
-        tool_manager.register_tool(mock_tool)
+        tool_manager_tm.register_tool(mock_tool_tm)
 
-        assert "test_tool" in tool_manager.tools
-        assert tool_manager.tools["test_tool"] == mock_tool
+        assert "test_tool" in tool_manager_tm.tools
+        assert tool_manager_tm.tools["test_tool"] == mock_tool_tm
 
-    def test_get_tool_definitions(self, tool_manager, mock_tool):
+    def test_get_tool_definitions(self, tool_manager_tm, mock_tool_tm):
         """Test getting all tool definitions"""
-        tool_manager.register_tool(mock_tool)
+        tool_manager_tm.register_tool(mock_tool_tm)
 
-        definitions = tool_manager.get_tool_definitions()
+        definitions = tool_manager_tm.get_tool_definitions()
 
         assert len(definitions) == 1
         assert definitions[0]["name"] == "test_tool"
 
-    def test_execute_tool(self, tool_manager, mock_tool):
+    def test_execute_tool(self, tool_manager_tm, mock_tool_tm):
         """Test executing a tool by name"""
-        tool_manager.register_tool(mock_tool)
+        tool_manager_tm.register_tool(mock_tool_tm)
 
-        result = tool_manager.execute_tool("test_tool", param1="value1")
+        result = tool_manager_tm.execute_tool("test_tool", param1="value1")
 
         assert result == "Tool executed"
-        mock_tool.execute.assert_called_once_with(param1="value1")
+        assert mock_tool_tm.calls == [{"param1": "value1"}]
 
-    def test_execute_nonexistent_tool(self, tool_manager):
+    def test_execute_nonexistent_tool(self, tool_manager_tm):
         """Test executing a tool that doesn't exist"""
-        result = tool_manager.execute_tool("nonexistent_tool")
+        result = tool_manager_tm.execute_tool("nonexistent_tool")
 
         assert "not found" in result
 
-    def test_get_last_sources(self, tool_manager):
+    def test_get_last_sources(self, tool_manager_tm):
         """Test getting last sources from tools"""
         # Create a tool with last_sources
-        tool = Mock()
-        tool.get_tool_definition.return_value = {"name": "search_tool"}
+        tool = StubTool({"name": "search_tool"})
         tool.last_sources = ["Source 1", "Source 2"]
 
-        tool_manager.register_tool(tool)
+        tool_manager_tm.register_tool(tool)
 
-        sources = tool_manager.get_last_sources()
+        sources = tool_manager_tm.get_last_sources()
 
         assert sources == ["Source 1", "Source 2"]
 
-    def test_reset_sources(self, tool_manager):
+    def test_reset_sources(self, tool_manager_tm):
         """Test resetting sources"""
         # Create a tool with last_sources
-        tool = Mock()
-        tool.get_tool_definition.return_value = {"name": "search_tool"}
+        tool = StubTool({"name": "search_tool"})
         tool.last_sources = ["Source 1", "Source 2"]
 
-        tool_manager.register_tool(tool)
-        tool_manager.reset_sources()
+        tool_manager_tm.register_tool(tool)
+        tool_manager_tm.reset_sources()
 
         assert tool.last_sources == []
@@ -1,78 +1,116 @@
-import os
-import sys
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-import shutil
-import tempfile
-
 import pytest
 from config import config
 from models import Course, CourseChunk, Lesson
+from tests.fakes.fake_vector_store import FakeVectorStore
 from vector_store import SearchResults, VectorStore
 
 
+def _build_sample_course() -> Course:
+    """Build the canonical sample course used across this module"""
+    lessons = [
+        Lesson(
+            lesson_number=0,
+            title="Introduction to Python",
+            content="Python is a programming language",
+            lesson_link="https://example.com/lesson0",
+        ),
+        Lesson(
+            lesson_number=1,
+            title="Variables and Types",
+            content="Variables store data. Types include int, float, string",
+            lesson_link="https://example.com/lesson1",
+        ),
+    ]
+    return Course(
+        title="Python Basics",
+        course_link="https://example.com/course",
+        instructor="Test Instructor",
+        lessons=lessons,
+    )
+
+
+def _build_sample_chunks(course: Course) -> list:
+    """Build the canonical sample chunks for the sample course"""
+    return [
+        CourseChunk(
+            course_title=course.title,
+            lesson_number=0,
+            content="Python is a high-level programming language",
+            chunk_index=0,
+        ),
+        CourseChunk(
+            course_title=course.title,
+            lesson_number=1,
+            content="Variables in Python can store different types of data",
+            chunk_index=1,
+        ),
+    ]
+
+
+@pytest.fixture(
+    scope="session",
+    params=[
+        pytest.param("fake", id="fake"),
+        pytest.param("real", id="real", marks=pytest.mark.slow),
+    ],
+)
+def shared_vector_store(request, tmp_path_factory):
+    """One store per backend for the whole session
+
+    The dict-backed fake covers the store logic in microseconds; the real
+    ChromaDB + sentence-transformers backend is marked slow so --fast runs
+    skip the model load.
+    """
+    if request.param == "real":
+        db_path = str(tmp_path_factory.mktemp("vector_store"))
+        return VectorStore(db_path, config.EMBEDDING_MODEL, max_results=5)
+    return FakeVectorStore(max_results=5)
+
+
 class TestVectorStore:
     """Test vector store functionality including the MAX_RESULTS bug"""
 
-    @pytest.fixture
-    def temp_db_path(self):
-        """Create temporary directory for test database"""
-        temp_dir = tempfile.mkdtemp()
-        yield temp_dir
-        shutil.rmtree(temp_dir)
+    # Pin to one xdist worker so the session-scoped store (and the real
+    # backend's model load) isn't duplicated across workers
+    pytestmark = pytest.mark.xdist_group("vstore")
 
     @pytest.fixture
-    def vector_store_zero_results(self, temp_db_path):
-        """Create vector store with MAX_RESULTS=0 (reproduces bug)"""
-        return VectorStore(temp_db_path, config.EMBEDDING_MODEL, max_results=0)
+    def vector_store_zero_results(self, shared_vector_store):
+        """Shared store, cleared and configured with MAX_RESULTS=0 (the bug)"""
+        shared_vector_store.clear_all_data()
+        shared_vector_store.max_results = 0
+        return shared_vector_store
 
     @pytest.fixture
-    def vector_store_normal(self, temp_db_path):
-        """Create vector store with normal MAX_RESULTS"""
-        return VectorStore(temp_db_path, config.EMBEDDING_MODEL, max_results=5)
+    def vector_store_normal(self, shared_vector_store):
+        """Shared store, cleared and configured with normal MAX_RESULTS"""
+        shared_vector_store.clear_all_data()
+        shared_vector_store.max_results = 5
+        return shared_vector_store
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_course(self):
         """Create sample course for testing"""
-        lessons = [
-            Lesson(
-                lesson_number=0,
-                title="Introduction to Python",
-                content="Python is a programming language",
-                lesson_link="https://example.com/lesson0",
-            ),
-            Lesson(
-                lesson_number=1,
-                title="Variables and Types",
-                content="Variables store data. Types include int, float, string",
-                lesson_link="https://example.com/lesson1",
-            ),
-        ]
-        return Course(
-            title="Python Basics",
-            course_link="https://example.com/course",
-            instructor="Test Instructor",
-            lessons=lessons,
-        )
+        return _build_sample_course()
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_chunks(self, sample_course):
         """Create sample chunks for testing"""
-        return [
-            CourseChunk(
-                course_title=sample_course.title,
-                lesson_number=0,
-                content="Python is a high-level programming language",
-                chunk_index=0,
-            ),
-            CourseChunk(
-                course_title=sample_course.title,
-                lesson_number=1,
-                content="Variables in Python can store different types of data",
-                chunk_index=1,
-            ),
-        ]
+        return _build_sample_chunks(sample_course)
+
+    @pytest.fixture
+    def populated_store(self, shared_vector_store, sample_course, sample_chunks):
+        """Shared store reset to contain exactly the sample course
+
+        Clearing and re-ingesting unconditionally keeps every test
+        independent of which neighbors ran before it; the embedding cost is
+        negligible on the fake backend and two chunks on the real one.
+        """
+        shared_vector_store.clear_all_data()
+        shared_vector_store.max_results = 5
+        shared_vector_store.add_course_metadata(sample_course)
+        shared_vector_store.add_course_content(sample_chunks)
+        return shared_vector_store
 
     def test_search_with_zero_max_results(
         self, vector_store_zero_results, sample_course, sample_chunks
@@ -92,16 +130,10 @@ class TestVectorStore:
             len(results.documents) == 0
         ), f"Expected 0 documents, got {len(results.documents)}"
 
-    def test_search_with_normal_max_results(
-        self, vector_store_normal, sample_course, sample_chunks
-    ):
+    def test_search_with_normal_max_results(self, populated_store):
         """Test that normal MAX_RESULTS returns results"""
-        # Add test data
-        vector_store_normal.add_course_metadata(sample_course)
-        vector_store_normal.add_course_content(sample_chunks)
-
         # Search should return results
-        results = vector_store_normal.search("Python programming")
+        results = populated_store.search("Python programming")
 
         assert (
             not results.is_empty()
@@ -110,29 +142,24 @@ class TestVectorStore:
             len(results.documents) > 0
         ), f"Expected results, got {len(results.documents)} documents"
 
-    def test_course_name_resolution(self, vector_store_normal, sample_course):
+    def test_course_name_resolution(self, populated_store):
         """Test course name resolution works"""
-        vector_store_normal.add_course_metadata(sample_course)
-
         # Test exact match
-        resolved = vector_store_normal._resolve_course_name("Python Basics")
+        resolved = populated_store._resolve_course_name("Python Basics")
         assert (
             resolved == "Python Basics"
         ), f"Expected 'Python Basics', got '{resolved}'"
 
         # Test partial match
-        resolved_partial = vector_store_normal._resolve_course_name("Python")
+        resolved_partial = populated_store._resolve_course_name("Python")
         assert (
             resolved_partial == "Python Basics"
         ), f"Expected 'Python Basics', got '{resolved_partial}'"
 
-    def test_lesson_filtering(self, vector_store_normal, sample_course, sample_chunks):
+    def test_lesson_filtering(self, populated_store):
         """Test filtering by lesson number"""
-        vector_store_normal.add_course_metadata(sample_course)
-        vector_store_normal.add_course_content(sample_chunks)
-
         # Search in specific lesson
-        results = vector_store_normal.search("data", lesson_number=1)
+        results = populated_store.search("data", lesson_number=1)
 
         if not results.is_empty():
             # Check all results are from lesson 1
@@ -141,13 +168,10 @@ class TestVectorStore:
                     metadata.get("lesson_number") == 1
                 ), "Results should only be from lesson 1"
 
-    def test_course_filtering(self, vector_store_normal, sample_course, sample_chunks):
+    def test_course_filtering(self, populated_store):
         """Test filtering by course name"""
-        vector_store_normal.add_course_metadata(sample_course)
-        vector_store_normal.add_course_content(sample_chunks)
-
         # Search in specific course
-        results = vector_store_normal.search("programming", course_name="Python Basics")
+        results = populated_store.search("programming", course_name="Python Basics")
 
         if not results.is_empty():
             # Check all results are from the specified course
@@ -156,6 +180,20 @@ class TestVectorStore:
                     metadata.get("course_title") == "Python Basics"
                 ), "Results should only be from Python Basics"
 
+    @pytest.mark.benchmark
+    def test_search_benchmark(self, populated_store, benchmark):
+        """Benchmark a populated search on the active backend"""
+        results = benchmark(lambda: populated_store.search("Python programming"))
+        assert not results.is_empty()
+
+    @pytest.mark.benchmark
+    def test_zero_limit_search_benchmark(self, vector_store_zero_results, benchmark):
+        """Benchmark the zero-limit short-circuit path"""
+        results = benchmark(
+            lambda: vector_store_zero_results.search("Python programming")
+        )
+        assert results.is_empty()
+
     def test_empty_search_response(self, vector_store_normal):
         """Test handling of searches with no results"""
         # Search in empty database
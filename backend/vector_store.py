@@ -1,15 +1,18 @@
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings
+from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
 from config import config
 from models import Course, CourseChunk
 from sentence_transformers import SentenceTransformer
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResults:
     """Container for search results with metadata"""
 
@@ -43,6 +46,45 @@ class SearchResults:
         return len(self.documents) == 0
 
 
+class _BatchedSentenceTransformerEmbeddingFunction(
+    SentenceTransformerEmbeddingFunction
+):
+    """SentenceTransformer embedding function with explicit batched encode
+
+    sentence-transformers releases the GIL during the forward pass, so
+    encoding a whole ingest as explicit batches keeps large
+    add_course_content calls in a few batched passes instead of Chroma's
+    defaults, and skips the progress bar overhead. Subclassing the built-in
+    function keeps the EmbeddingFunction interface (name(), config
+    serialization) that Chroma's collection validation requires.
+    """
+
+    BATCH_SIZE = 64
+
+    def __call__(self, input):
+        embeddings = self._model.encode(
+            list(input),
+            batch_size=self.BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=self.normalize_embeddings,
+            show_progress_bar=False,
+        )
+
+        return [np.array(embedding, dtype=np.float32) for embedding in embeddings]
+
+
+@lru_cache(maxsize=4)
+def _get_embedding_function(embedding_model: str):
+    """Create (or reuse) the SentenceTransformer embedding function
+
+    Cached per model name so repeated VectorStore constructions share one
+    loaded model instead of re-initializing it each time.
+    """
+    return _BatchedSentenceTransformerEmbeddingFunction(
+        model_name=f"sentence-transformers/{embedding_model}"
+    )
+
+
 class VectorStore:
     """Vector storage using ChromaDB for course content and metadata"""
 
@@ -58,15 +100,9 @@ class VectorStore:
             os.environ["HF_TOKEN"] = config.HF_TOKEN
             os.environ["HUGGING_FACE_HUB_TOKEN"] = config.HF_TOKEN
 
-        # Use ChromaDB's built-in SentenceTransformer function with the token set
-        from chromadb.utils.embedding_functions import (
-            SentenceTransformerEmbeddingFunction,
-        )
-
-        # The token is now in the environment, so the function should use it
-        self.embedding_function = SentenceTransformerEmbeddingFunction(
-            model_name=f"sentence-transformers/{embedding_model}"
-        )
+        # The token is now in the environment, so the function should use it;
+        # the function itself is memoized per model name
+        self.embedding_function = _get_embedding_function(embedding_model)
 
         # Create collections for different types of data
         self.course_catalog = self._create_collection(
@@ -76,6 +112,10 @@ class VectorStore:
             "course_content"
         )  # Actual course material
 
+        # Memoized course-name resolutions; cleared whenever the catalog
+        # changes so repeated filtered searches skip the embedding lookup
+        self._resolve_cache: Dict[str, Optional[str]] = {}
+
     def _create_collection(self, name: str):
         """Create or get a ChromaDB collection"""
         return self.client.get_or_create_collection(
@@ -101,6 +141,14 @@ class VectorStore:
         Returns:
             SearchResults object with documents and metadata
         """
+        # Use provided limit or fall back to configured max_results
+        search_limit = limit if limit is not None else self.max_results
+
+        # A non-positive limit can't return anything; skip the query (and
+        # its embedding pass) entirely
+        if search_limit <= 0:
+            return SearchResults(documents=[], metadata=[], distances=[])
+
         # Step 1: Resolve course name if provided
         course_title = None
         if course_name:
@@ -112,9 +160,6 @@ class VectorStore:
         filter_dict = self._build_filter(course_title, lesson_number)
 
         # Step 3: Search course content
-        # Use provided limit or fall back to configured max_results
-        search_limit = limit if limit is not None else self.max_results
-
         try:
             results = self.course_content.query(
                 query_texts=[query], n_results=search_limit, where=filter_dict
@@ -125,16 +170,21 @@ class VectorStore:
 
     def _resolve_course_name(self, course_name: str) -> Optional[str]:
         """Use vector search to find best matching course by name"""
+        if course_name in self._resolve_cache:
+            return self._resolve_cache[course_name]
+
+        resolved = None
         try:
             results = self.course_catalog.query(query_texts=[course_name], n_results=1)
 
             if results["documents"][0] and results["metadatas"][0]:
                 # Return the title (which is now the ID)
-                return results["metadatas"][0][0]["title"]
+                resolved = results["metadatas"][0][0]["title"]
         except Exception as e:
             print(f"Error resolving course name: {e}")
 
-        return None
+        self._resolve_cache[course_name] = resolved
+        return resolved
 
     def _build_filter(
         self, course_title: Optional[str], lesson_number: Optional[int]
@@ -190,6 +240,9 @@ class VectorStore:
             ids=[course.title],
         )
 
+        # Catalog changed: stale resolutions must be recomputed
+        self._resolve_cache.clear()
+
     def add_course_content(self, chunks: List[CourseChunk]):
         """Add course content chunks to the vector store"""
         if not chunks:
@@ -220,6 +273,7 @@ class VectorStore:
             # Recreate collections
             self.course_catalog = self._create_collection("course_catalog")
             self.course_content = self._create_collection("course_content")
+            self._resolve_cache.clear()
         except Exception as e:
             print(f"Error clearing data: {e}")
 